@@ -0,0 +1,8 @@
+"""
+CLI 子命令包。
+
+每个子命令位于独立模块中并暴露 `command` 属性，由 `cli.LazyGroup` 在分发时按需导入。
+"""
+
+# 用于识别由 aicommit 安装的 git hook
+HOOK_MARKER = "Managed by aicommit"
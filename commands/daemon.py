@@ -0,0 +1,123 @@
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+import click
+
+# hook 脚本与守护进程约定的 Unix socket 路径
+DAEMON_SOCKET_PATH = Path("~/.cache/aicommit/daemon.sock").expanduser()
+
+# 应答状态：hook 脚本只在 ok/skipped 时直接退出，其余情况回退到 `aicommit generate`
+REPLY_OK = "ok"
+REPLY_SKIPPED = "skipped"
+REPLY_ERROR = "error"
+
+
+async def handle_hook_request(
+    cwd: str,
+    commit_msg_file: str,
+    commit_source: str,
+    git_env: Optional[Mapping[str, str]] = None,
+) -> str:
+    """
+    在守护进程中执行一次 hook 模式的生成，返回应答状态行。
+
+    git_env 为 hook 进程中的 GIT_INDEX_FILE 等变量（见 `utils.git.HOOK_ENV_VARS`），
+    使 `git commit -a` 等使用临时索引的提交读到与 hook 相同的暂存内容。
+    git 命令依赖进程工作目录，因此调用方需保证请求串行执行。
+    """
+    from commands.generate import run_generation, should_skip_hook_run
+    from config.logic import load_and_merge_configs
+    from utils.git import has_staged_changes, hook_environment, is_git_repository
+    from utils.logger import logger
+
+    try:
+        os.chdir(cwd)
+        # 配置在进程内缓存，未改动时不会重新解析 YAML
+        config = load_and_merge_configs()
+        if should_skip_hook_run(config, commit_msg_file, commit_source, no_overwrite=None):
+            return REPLY_SKIPPED
+        with hook_environment(git_env or {}):
+            if not is_git_repository() or not has_staged_changes():
+                return REPLY_SKIPPED
+            message = await run_generation(config)
+
+        with open(commit_msg_file, "w", encoding="utf-8") as f:
+            f.write(message)
+        return REPLY_OK
+    except Exception as e:
+        logger.error(f"守护进程处理 hook 请求失败: {e}")
+        return f"{REPLY_ERROR}: {e}"
+
+
+async def serve(socket_path: Path) -> None:
+    """监听 Unix socket，逐个处理 hook 请求"""
+    import asyncio
+    import signal
+
+    from utils.git import HOOK_ENV_VARS
+    from utils.logger import logger
+
+    # 请求之间需要切换工作目录，串行处理以免互相干扰
+    lock = asyncio.Lock()
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # 请求格式：工作目录、提交信息文件、提交来源及 HOOK_ENV_VARS 的值，各占一行；
+            # 旧版 hook 只发送前三行，缺少的行读作空字符串，即变量未设置
+            fields = [
+                (await reader.readline()).decode("utf-8").rstrip("\n")
+                for _ in range(3 + len(HOOK_ENV_VARS))
+            ]
+            git_env = dict(zip(HOOK_ENV_VARS, fields[3:]))
+            async with lock:
+                reply = await handle_hook_request(*fields[:3], git_env=git_env)
+            writer.write(reply.encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    # 移除上次异常退出遗留的 socket 文件
+    if socket_path.exists():
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # socket 创建时即仅限当前用户访问，不留 chmod 之前的窗口
+    umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(on_connect, path=str(socket_path))
+    finally:
+        os.umask(umask)
+    # 收到 SIGTERM 时关闭服务，以便清理 socket 文件
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, server.close)
+    logger.info(f"aicommit 守护进程已启动，监听 {socket_path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+@click.command("daemon")
+def daemon():
+    """
+    以常驻进程运行，使 git hook 复用已加载的模块与配置。
+    """
+    from utils.event_loop import run as run_event_loop
+
+    # 导入 collectors 和 providers 以注册它们，守护进程启动时一次性完成
+    import core.collectors
+    import core.llm.providers
+
+    try:
+        run_event_loop(serve(DAEMON_SOCKET_PATH))
+    except KeyboardInterrupt:
+        pass
+
+
+command = daemon
@@ -0,0 +1,282 @@
+import contextlib
+import os
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+import click
+
+from utils.errors import AICommitException
+from utils.event_loop import run as run_event_loop
+from utils.git import is_git_repository, has_staged_changes, commit
+
+if TYPE_CHECKING:
+    from config.models import Config
+
+
+def apply_cli_overrides(
+    config: "Config",
+    provider: str,
+    model: str,
+    template: str,
+    no_cache: bool = False,
+    stream: Optional[bool] = None,
+) -> "Config":
+    """将CLI选项应用于加载的配置"""
+    from utils.logger import logger
+
+    if provider:
+        config.model.provider = provider
+        logger.info(f"使用 provider 覆盖配置: {provider}")
+    if model:
+        config.model.name = model
+        logger.info(f"使用 model 覆盖配置: {model}")
+    if template:
+        config.formatter.template = template
+        logger.info(f"使用 template 覆盖配置: {template}")
+    if no_cache:
+        config.cache.enabled = False
+        logger.info("已通过 --no-cache 禁用缓存")
+    if stream is not None:
+        config.model.stream = stream
+        logger.info(f"使用 stream 覆盖配置: {stream}")
+    return config
+
+
+# 用户提供了 -m, --template, 或者正在进行 merge/squash 时，hook 不生成提交信息
+SKIPPED_COMMIT_SOURCES = ("message", "template", "merge", "squash")
+
+
+def _keep_existing_message(commit_msg_file: str, config_no_overwrite: bool, no_overwrite: Optional[bool]) -> bool:
+    """提交信息文件已有内容且不允许覆盖时返回 True"""
+    # 检查文件是否已包含内容
+    if os.path.exists(commit_msg_file) and os.path.getsize(commit_msg_file) > 0:
+        # CLI flag takes precedence over config
+        should_overwrite = not config_no_overwrite
+        if no_overwrite is not None: # a boolean value was passed
+            should_overwrite = not no_overwrite
+
+        if not should_overwrite:
+            return True
+
+    return False
+
+
+def should_skip_hook_run(config: "Config", commit_msg_file: str, commit_source: str, no_overwrite: Optional[bool]) -> bool:
+    """判断 hook 模式下是否应跳过生成"""
+    if not config.hook.enabled:
+        return True  # Hook is disabled in config
+
+    if commit_source in SKIPPED_COMMIT_SOURCES:
+        return True
+
+    return _keep_existing_message(commit_msg_file, config.hook.no_overwrite, no_overwrite)
+
+
+def should_skip_hook_run_early(config_path: Optional[str], commit_msg_file: str, commit_source: str, no_overwrite: Optional[bool]) -> bool:
+    """
+    在加载完整配置之前判断 hook 是否应跳过，避免导入 PyYAML/pydantic。
+
+    只在能确定跳过时返回 True；无法快速判断时返回 False，由完整配置决定。
+    """
+    if commit_source in SKIPPED_COMMIT_SOURCES:
+        return True
+
+    from config.hook_scan import scan_hook_config
+
+    hook_settings = scan_hook_config(config_path)
+    if hook_settings is None:
+        return False
+    if not hook_settings["enabled"]:
+        return True
+    return _keep_existing_message(commit_msg_file, hook_settings["no_overwrite"], no_overwrite)
+
+
+async def run_generation(config: "Config", on_chunk: Optional[Callable[[str], None]] = None) -> str:
+    """
+    初始化并运行提交信息生成流水线
+
+    传入 on_chunk 时以流式方式调用 LLM，并在收到模型输出时逐段回调
+    """
+    # 导入 collectors 和 providers 以注册它们
+    import core.collectors
+    import core.llm.providers
+    from core.pipeline import CommitMessageGenerator
+
+    pipeline = CommitMessageGenerator(config)
+    if on_chunk is not None:
+        return await pipeline.generate_streaming(on_chunk)
+    return await pipeline.generate()
+
+
+async def _generate_once(config: "Config", on_chunk: Optional[Callable[[str], None]] = None) -> str:
+    """单次 CLI 运行：生成后关闭共享的 HTTP 客户端（守护进程则保持连接复用）"""
+    from utils.http import aclose_async_client
+
+    try:
+        return await run_generation(config, on_chunk)
+    finally:
+        await aclose_async_client()
+
+
+# 流式面板的最小刷新间隔（约 30 帧/秒）
+STREAM_REFRESH_INTERVAL_SEC = 1 / 30
+
+
+def _run_streaming(console, config: "Config") -> str:
+    """在 rich Live 面板中边生成边显示，返回格式化后的提交信息"""
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+
+    text = Text()
+    panel = Panel(text, title="[bold green]正在生成提交信息...[/bold green]", border_style="green", expand=False)
+    # transient: 结束后清除实时面板，由调用方输出最终结果
+    last_refresh = 0.0
+    with Live(panel, console=console, transient=True, auto_refresh=False) as live:
+        def on_chunk(chunk: str) -> None:
+            nonlocal last_refresh
+            text.append(chunk)
+            # 每次刷新都会重新渲染整个面板；按帧率节流，避免逐 token 重绘
+            now = time.monotonic()
+            if now - last_refresh >= STREAM_REFRESH_INTERVAL_SEC:
+                live.refresh()
+                last_refresh = now
+
+        return run_event_loop(_generate_once(config, on_chunk))
+
+
+def _console():
+    """按需获取进程级共享的 console，避免在 hook 跳过路径上导入 rich"""
+    from utils.console import get_console
+
+    return get_console()
+
+
+@click.command("generate")
+@click.option(
+    "-c", "--config",
+    "config_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="自定义配置文件的路径",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="生成提交信息但不应用它",
+)
+@click.option(
+    "--no-overwrite",
+    is_flag=True,
+    default=None,  # Default to None to distinguish from False
+    help="在 hook 模式下，不覆盖已存在内容的提交信息文件",
+)
+@click.option("--provider", type=str, help="覆盖 LLM provider (例如 'openai')",)
+@click.option("--model", type=str, help="覆盖 LLM 模型名称 (例如 'gpt-4o-mini')",)
+@click.option("--template", type=str, help="覆盖要使用的模板文件",)
+@click.option("--no-cache", is_flag=True, default=False, help="跳过缓存，强制重新调用 LLM",)
+@click.option("--stream/--no-stream", default=None, help="在终端中实时显示模型输出（覆盖 model.stream 配置）",)
+@click.pass_context
+@click.option(
+    "--from-hook",
+    nargs=2,
+    type=click.Path(),
+    default=(None, None),
+    help="由 git hook 调用。接收 [commit_msg_file, commit_source]。内部使用。",
+    hidden=True,
+)
+def generate(ctx, config_path: str, dry_run: bool, no_overwrite: bool, provider: str, model:str, template: str, no_cache: bool, stream: Optional[bool], from_hook: tuple[str, str]):
+    """
+    生成提交信息。
+    """
+    commit_msg_file, commit_source = from_hook
+    is_hook_run = commit_msg_file is not None
+    # 大多数 hook 调用都会跳过生成，先用最小代价判断，再导入配置与日志模块
+    if is_hook_run and should_skip_hook_run_early(config_path, commit_msg_file, commit_source, no_overwrite):
+        return
+
+    from config.logic import load_and_merge_configs
+    from utils.logger import logger
+
+    verbose = ctx.obj.get('verbose', False)
+    # 输出先进入缓冲区，在命令结束时一次性写出
+    console = None
+
+    try:
+        # 0. 加载配置 (优先，因为 hook 逻辑可能需要配置)
+        config = load_and_merge_configs(custom_config_path=config_path)
+
+        # 如果从 hook 运行，执行 hook 的特定逻辑
+        if is_hook_run and should_skip_hook_run(config, commit_msg_file, commit_source, no_overwrite):
+            return
+
+        # 仅在确定需要生成时才导入事件循环与 rich
+        from rich.panel import Panel
+
+        console = _console()
+
+        # 1. 前置检查
+        if not is_git_repository():
+            raise AICommitException("不是一个 Git 仓库。请在 Git 仓库的根目录运行此命令。")
+        if not has_staged_changes():
+            raise AICommitException("没有发现暂存区的变更。请先执行 git add 命令。")
+
+        # 2. 应用CLI覆盖
+        config = apply_cli_overrides(config, provider, model, template, no_cache, stream)
+
+        # 3. 运行流水线
+        message = ""
+        interactive = console.is_terminal and not is_hook_run
+        try:
+            if interactive and config.model.stream:
+                # 流式模式：在临时面板中实时渲染模型输出，结束后再显示格式化后的结果
+                message = _run_streaming(console, config)
+            else:
+                # 仅在交互式终端中显示状态动画；hook 模式或输出被重定向时不启动刷新线程
+                if interactive:
+                    status_context = console.status("[bold green]正在生成提交信息...[/bold green]")
+                else:
+                    status_context = contextlib.nullcontext()
+                with status_context:
+                    message = run_event_loop(_generate_once(config))
+        except Exception as e:
+            logger.error(f"生成提交信息时出错: {e}", exc_info=verbose)
+            raise AICommitException(f"生成提交信息时出错: {e}")
+
+        # 4. 处理输出
+        if is_hook_run:
+            with open(commit_msg_file, "w", encoding="utf-8") as f:
+                f.write(message)
+            # hook 模式下静默退出
+            return
+
+        console.queue(Panel(
+            message,
+            title="[bold cyan]生成的提交信息[/bold cyan]",
+            border_style="cyan",
+            expand=False,
+        ))
+
+        if not dry_run:
+            commit(message)
+            console.queue("\n[bold green]✅ 提交成功![/bold green]")
+        else:
+            console.queue("\n[yellow]当前为预览模式。要提交信息，请移除 '--dry-run' 参数。[/yellow]")
+
+    except AICommitException as e:
+        logger.error(f"发生已知错误: {e}", exc_info=verbose)
+        # 在 hook 模式下，不要打印到控制台，以免干扰 git
+        if not is_hook_run:
+            console = _console()
+            console.queue(f"[bold red]错误:[/bold red] {e}")
+    except Exception as e:
+        logger.error(f"发生未知错误: {e}", exc_info=True)
+        if not is_hook_run:
+            console = _console()
+            console.queue(f"[bold red]发生未知错误:[/bold red] {e}")
+    finally:
+        if console is not None:
+            console.flush()
+
+
+command = generate
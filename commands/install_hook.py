@@ -0,0 +1,78 @@
+import os
+import stat
+
+import click
+
+from commands import HOOK_MARKER
+from utils.git import is_git_repository
+
+# socat 等待守护进程应答的秒数，需覆盖一次完整的 LLM 调用
+DAEMON_REPLY_TIMEOUT_SEC = 120
+
+
+HOOK_SCRIPT = """#!/bin/sh
+# aicommit git hook. {marker}.
+
+# The commit message file is passed as the first argument.
+COMMIT_MSG_FILE="$1"
+
+# The source of the commit message is the second argument.
+COMMIT_SOURCE="$2"
+
+# Fast path: hand the request to a running `aicommit daemon`, if any.
+# git's own variables go along, so that e.g. `git commit -a` is served from its
+# temporary index rather than the daemon's view of the repository.
+DAEMON_SOCKET="$HOME/.cache/aicommit/daemon.sock"
+if [ -S "$DAEMON_SOCKET" ] && command -v socat >/dev/null 2>&1; then
+    REPLY=$(printf '%s\\n%s\\n%s\\n%s\\n%s\\n%s\\n' "$PWD" "$COMMIT_MSG_FILE" "$COMMIT_SOURCE" \\
+        "$GIT_INDEX_FILE" "$GIT_DIR" "$GIT_WORK_TREE" \\
+        | socat -t {timeout} - UNIX-CONNECT:"$DAEMON_SOCKET" 2>/dev/null)
+    case "$REPLY" in
+        ok|skipped) exit 0 ;;
+    esac
+fi
+
+# Call the generator and pass along the git hook arguments.
+# The command will internally decide whether to run.
+exec aicommit generate --from-hook "$COMMIT_MSG_FILE" "$COMMIT_SOURCE"
+""".format(marker=HOOK_MARKER, timeout=DAEMON_REPLY_TIMEOUT_SEC)
+
+
+@click.command("install-hook")
+def install_hook():
+    """
+    安装 git hook 以在 'git commit' 时自动生成消息。
+    """
+    from utils.console import get_console
+
+    console = get_console()
+    if not is_git_repository():
+        console.print("[bold red]错误:[/bold red] 不是一个 Git 仓库。")
+        return
+
+    hooks_dir = os.path.join(".git", "hooks")
+    hook_path = os.path.join(hooks_dir, "prepare-commit-msg")
+
+    if not os.path.exists(hooks_dir):
+        os.makedirs(hooks_dir)
+
+    if os.path.exists(hook_path):
+        with open(hook_path, "r", encoding="utf-8") as f:
+            content = f.read()
+            if HOOK_MARKER not in content:
+                console.print(f"[bold yellow]警告:[/bold yellow] 一个自定义的 'prepare-commit-msg' hook 已存在。")
+                if not click.confirm("你确定要覆盖它吗? (建议先备份)"):
+                    return
+
+    with open(hook_path, "w", encoding="utf-8") as f:
+        f.write(HOOK_SCRIPT)
+
+    # 赋予执行权限
+    st = os.stat(hook_path)
+    os.chmod(hook_path, st.st_mode | stat.S_IEXEC)
+
+    console.print("[bold green]✅ Git hook 安装成功![/bold green]")
+    console.print("现在，当你运行 'git commit' 时，将自动为你生成提交信息。")
+
+
+command = install_hook
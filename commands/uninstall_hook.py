@@ -0,0 +1,36 @@
+import os
+
+import click
+
+from commands import HOOK_MARKER
+from utils.git import is_git_repository
+
+
+@click.command("uninstall-hook")
+def uninstall_hook():
+    """
+    卸载 aicommit 的 git hook。
+    """
+    from utils.console import get_console
+
+    console = get_console()
+    if not is_git_repository():
+        console.print("[bold red]错误:[/bold red] 不是一个 Git 仓库。")
+        return
+
+    hook_path = os.path.join(".git", "hooks", "prepare-commit-msg")
+
+    if os.path.exists(hook_path):
+        with open(hook_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        if HOOK_MARKER in content:
+            os.remove(hook_path)
+            console.print("[bold green]✅ Git hook 卸载成功![/bold green]")
+        else:
+            console.print("[bold yellow]警告:[/bold yellow] 'prepare-commit-msg' hook 不是由 aicommit 安装的。请手动移除。")
+    else:
+        console.print("[yellow]未找到 aicommit 的 git hook。[/yellow]")
+
+
+command = uninstall_hook
@@ -0,0 +1,15 @@
+# Generated from default.yaml by `python -m config.build_defaults`. Do not edit.
+# `${VAR}` references are resolved from the environment at load time.
+
+DEFAULTS_DIGEST = '0e1cdfd251a84e321d2a4f7b1e68ecd3'
+
+DEFAULTS = {'model': {'provider': 'openai',
+           'name': 'gpt-4o-mini',
+           'api_key': '${OPENAI_API_KEY}',
+           'timeout_sec': 20},
+ 'formatter': {'template': 'conventional.j2', 'template_dir': None},
+ 'collectors': [{'type': 'diff',
+                 'options': {'staged_only': True, 'detect_functions': False}},
+                {'type': 'history', 'options': {'scope': 'repo', 'limit': 5}}],
+ 'output': {'language': 'en', 'max_subject_len': 72, 'wrap_body_at': 100},
+ 'cache': {'enabled': True, 'ttl_sec': 3600, 'directory': '~/.cache/aicommit'}}
@@ -0,0 +1,63 @@
+"""
+Regenerates `config/_default_config.py` from `config/default.yaml`.
+
+The packaged defaults never change between releases, so they are shipped as a
+Python literal and the common "no user or project config" run never parses YAML.
+Run `python -m config.build_defaults` after editing `default.yaml`.
+"""
+import hashlib
+import pprint
+from pathlib import Path
+from typing import Any, Dict
+
+from config.loader import EnvSafeLoader
+
+DEFAULT_YAML_PATH = Path(__file__).parent / "default.yaml"
+DEFAULT_MODULE_PATH = Path(__file__).parent / "_default_config.py"
+
+MODULE_TEMPLATE = '''# Generated from default.yaml by `python -m config.build_defaults`. Do not edit.
+# `${{VAR}}` references are resolved from the environment at load time.
+
+DEFAULTS_DIGEST = {digest!r}
+
+DEFAULTS = {defaults}
+'''
+
+
+class _RawEnvLoader(EnvSafeLoader):
+    """Keeps `${VAR}` references as written instead of resolving them at build time."""
+
+
+_RawEnvLoader.add_constructor("!env", lambda loader, node: loader.construct_scalar(node))
+
+
+def default_yaml_digest(source: bytes) -> str:
+    """Fingerprints the default.yaml contents the module was generated from."""
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def load_default_yaml(source: bytes) -> Dict[str, Any]:
+    """Parses default.yaml, leaving environment references unresolved."""
+    loader = _RawEnvLoader(source.decode("utf-8"))
+    try:
+        return loader.get_single_data() or {}
+    finally:
+        loader.dispose()
+
+
+def render_default_module(source: bytes) -> str:
+    """Renders the source of `_default_config.py` for the given default.yaml contents."""
+    return MODULE_TEMPLATE.format(
+        digest=default_yaml_digest(source),
+        defaults=pprint.pformat(load_default_yaml(source), sort_dicts=False),
+    )
+
+
+def main() -> None:
+    source = DEFAULT_YAML_PATH.read_bytes()
+    DEFAULT_MODULE_PATH.write_text(render_default_module(source), encoding="utf-8")
+    print(f"Wrote {DEFAULT_MODULE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
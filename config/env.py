@@ -0,0 +1,20 @@
+import re
+
+# Regex for environment variable substitution, e.g. `${OPENAI_API_KEY}`.
+# Kept apart from the YAML loader so that resolving references does not import PyYAML.
+ENV_VAR_MATCHER = re.compile(r"\$\{(\w+)\}")
+
+
+class EnvValue(str):
+    """
+    A config string substituted from the environment variable `name`.
+
+    The marker travels with the value through merging, so the config cache can
+    tell which keys came from the environment (and must not be written to disk)
+    from literals that merely look like `${VAR}` or equal a secret.
+    """
+
+    def __new__(cls, value: str, name: str) -> "EnvValue":
+        self = super().__new__(cls, value)
+        self.name = name
+        return self
@@ -0,0 +1,93 @@
+"""
+A minimal reader for the `hook:` section of the config files.
+
+`git commit` runs the hook on every commit, and most of those runs end up
+skipping generation. This module lets the hook decide that without importing
+PyYAML or pydantic: it scans the files line by line and gives up (returns
+None) on anything that is not a plain block mapping of boolean values, in
+which case the caller falls back to the full config loader.
+"""
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import paths
+from config._default_config import DEFAULTS
+
+HOOK_SECTION_MATCHER = re.compile(r"hook:[ \t]*(?:#.*)?")
+HOOK_KEY_MATCHER = re.compile(r"[ \t]+(enabled|no_overwrite):[ \t]*([^\s#]*)[ \t]*(?:#.*)?")
+# YAML 1.1 booleans, as resolved by PyYAML's SafeLoader.
+YAML_BOOLEANS = {
+    "true": True, "True": True, "TRUE": True,
+    "false": False, "False": False, "FALSE": False,
+    "yes": True, "Yes": True, "YES": True,
+    "no": False, "No": False, "NO": False,
+    "on": True, "On": True, "ON": True,
+    "off": False, "Off": False, "OFF": False,
+}
+
+
+def _scan_hook_section(text: str) -> Optional[Dict[str, bool]]:
+    """
+    Returns the keys set in the top-level `hook:` block of one YAML document,
+    or None if the section cannot be read without a YAML parser.
+    """
+    settings: Dict[str, bool] = {}
+    in_section = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if not line[0].isspace():
+            # A top-level key: the hook block (if any) starts or ends here.
+            if HOOK_SECTION_MATCHER.fullmatch(line):
+                in_section = True
+            elif line.startswith("hook") or line.startswith(("{", "---", "%", "<<", "?")):
+                return None  # flow style, directives, merge keys or several documents
+            else:
+                in_section = False
+            continue
+        if not in_section:
+            continue
+        match = HOOK_KEY_MATCHER.fullmatch(line)
+        if not match or match.group(2) not in YAML_BOOLEANS:
+            return None
+        settings[match.group(1)] = YAML_BOOLEANS[match.group(2)]
+    return settings
+
+
+def _config_files(custom_config_path: Optional[str]) -> List[Path]:
+    """Returns the config files `load_and_merge_configs` would read, in merge order."""
+    if custom_config_path:
+        return [Path(custom_config_path)]
+    files = []
+    if paths.stat_regular_file(paths.USER_CONFIG_PATH):
+        files.append(paths.USER_CONFIG_PATH)
+    project_config_path = paths.find_project_config()
+    if project_config_path:
+        files.append(project_config_path)
+    return files
+
+
+def scan_hook_config(custom_config_path: Optional[str] = None) -> Optional[Dict[str, bool]]:
+    """
+    Reads the effective `hook.enabled` and `hook.no_overwrite` settings.
+
+    Returns:
+        A dict with both keys, or None if any config file needs the full loader.
+    """
+    default_hook = DEFAULTS.get("hook") or {}
+    settings = {
+        "enabled": default_hook.get("enabled", True),
+        "no_overwrite": default_hook.get("no_overwrite", False),
+    }
+    for path in _config_files(custom_config_path):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        file_settings = _scan_hook_section(text)
+        if file_settings is None:
+            return None
+        settings.update(file_settings)
+    return settings
@@ -1,20 +1,28 @@
 import os
-import re
 import yaml
 from typing import Any, Dict, IO
 
+from config.env import ENV_VAR_MATCHER, EnvValue
 from utils.errors import ConfigError
 
-# Regex for environment variable substitution
-ENV_VAR_MATCHER = re.compile(r"\$\{(\w+)\}")
+try:
+    # libyaml-backed loader; several times faster than the pure-Python one.
+    from yaml import CSafeLoader as _BaseSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _BaseSafeLoader
+
 
 def _env_var_constructor(loader: yaml.SafeLoader, node: yaml.ScalarNode) -> str:
     """
     Custom YAML constructor to substitute environment variables.
-    e.g., ${VAR_NAME} will be replaced by the value of the VAR_NAME environment variable.
+    e.g., ${VAR_NAME} will be replaced by the value of the VAR_NAME environment variable,
+    as an `EnvValue` that records where it came from.
     """
     value = loader.construct_scalar(node)
-    match = ENV_VAR_MATCHER.match(value)
+    # Cheap substring test first, so that plain scalars never reach the regex engine.
+    if "${" not in value:
+        return value
+    match = ENV_VAR_MATCHER.fullmatch(value)
     if not match:
         return value
 
@@ -22,22 +30,33 @@ def _env_var_constructor(loader: yaml.SafeLoader, node: yaml.ScalarNode) -> str:
     replacement = os.getenv(env_var)
     if replacement is None:
         raise ConfigError(f"Environment variable '{env_var}' not found for substitution in config.")
+    return EnvValue(replacement, env_var)
+
+
+class EnvSafeLoader(_BaseSafeLoader):
+    """
+    A safe YAML loader (C-accelerated when available) with `!env` support.
+    Subclassed so that registering the constructor does not mutate PyYAML's own loaders.
+    """
+
+
+EnvSafeLoader.add_constructor("!env", _env_var_constructor)
+EnvSafeLoader.add_implicit_resolver("!env", ENV_VAR_MATCHER, None)
 
-    return replacement
 
-def get_config_loader() -> yaml.Loader:
+def get_config_loader() -> type:
     """
     Get a YAML loader that supports environment variable substitution.
     """
-    loader = yaml.SafeLoader
-    loader.add_constructor("!env", _env_var_constructor)
-    loader.add_implicit_resolver("!env", ENV_VAR_MATCHER, None)
-    return loader
+    return EnvSafeLoader
+
 
 def load_config(config_file: IO[str]) -> Dict[str, Any]:
     """
     Loads a YAML configuration file.
 
+    Values substituted from the environment are `EnvValue` strings.
+
     Args:
         config_file: A file-like object representing the YAML configuration.
 
@@ -48,8 +67,11 @@ def load_config(config_file: IO[str]) -> Dict[str, Any]:
         ConfigError: If the file cannot be parsed.
     """
     try:
-        loader = get_config_loader()
-        config = yaml.load(config_file, Loader=loader)
+        loader = get_config_loader()(config_file)
+        try:
+            config = loader.get_single_data()
+        finally:
+            loader.dispose()
         return config if config else {}
     except yaml.YAMLError as e:
         raise ConfigError(f"Failed to parse YAML configuration: {e}") from e
@@ -1,99 +1,282 @@
-import collections.abc
+import hashlib
 import os
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from config.loader import load_config
+from pydantic import TypeAdapter
+
+from config._default_config import DEFAULTS, DEFAULTS_DIGEST
+from config.env import ENV_VAR_MATCHER, EnvValue
 from config.models import Config
-from utils.errors import AICommitException
+from config.paths import USER_CONFIG_PATH, find_project_config, stat_regular_file
+from utils.errors import AICommitException, ConfigError
 from utils.logger import logger
 
+# Source of the packaged defaults; `DEFAULTS` is generated from it by `python -m config.build_defaults`.
 DEFAULT_CONFIG_PATH = Path(__file__).parent / "default.yaml"
-USER_CONFIG_DIR = Path.home() / ".aicommit"
-USER_CONFIG_PATH = USER_CONFIG_DIR / "config.yaml"
-PROJECT_CONFIG_FILENAME = ".aicommit.yaml"
+# The merged config is cached here, keyed by the source files' stat fingerprint.
+CONFIG_CACHE_DIR = Path("~/.cache/aicommit").expanduser()
+# A key path into the merged config: mapping keys and list indices from the root.
+_KeyPath = Tuple[Any, ...]
+# Bumped whenever the layout of the cache files changes.
+_CACHE_FORMAT = 2
+# A cache entry: the merged config with environment values blanked, and their variables by key path.
+_CachedConfig = Tuple[Dict[str, Any], Dict[_KeyPath, str]]
+# Which config files apply (and whether the defaults do), independent of their contents.
+_SourcesKey = Tuple[bool, Tuple[str, ...]]
+# In-process copy of the cache files, for long-lived processes such as `aicommit daemon`.
+# Only the latest version of each source set is kept, so editing a config replaces its
+# entry instead of adding one. Entries keep environment values redacted, like the files.
+_MERGED_CONFIG_MEMO: Dict[_SourcesKey, Tuple[Path, _CachedConfig]] = {}
+# Built once at import and reused for every validation.
+_CONFIG_ADAPTER: TypeAdapter[Config] = TypeAdapter(Config)
 
 
 def deep_merge(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Recursively merges two dictionaries.
+    Merges `source` into `target` in place, descending into nested dictionaries.
     Arrays are replaced, not merged.
     """
-    for key, value in source.items():
-        if isinstance(value, collections.abc.Mapping) and key in target and isinstance(target[key], collections.abc.Mapping):
-            target[key] = deep_merge(target[key], value)
-        else:
-            target[key] = value
+    # An explicit stack instead of recursion; merged configs are plain dicts
+    # straight from YAML, so an exact type check is enough.
+    stack = [(target, source)]
+    while stack:
+        target_node, source_node = stack.pop()
+        for key, value in source_node.items():
+            target_value = target_node.get(key)
+            if type(value) is dict and type(target_value) is dict:
+                stack.append((target_value, value))
+            else:
+                target_node[key] = value
     return target
 
 
-def find_project_root(start_dir: Path = Path(".")) -> Optional[Path]:
+def _config_cache_path(config_sources: List[Tuple[Path, os.stat_result]], use_defaults: bool) -> Path:
     """
-    Finds the project root by searching upwards for a .git directory or pyproject.toml.
+    Returns the cache file for the given config sources and their stat results.
+    The key changes whenever any source file is edited, replaced or moved,
+    or when the packaged defaults change.
     """
-    d = start_dir.resolve()
-    while d != d.parent:
-        if (d / ".git").is_dir() or (d / "pyproject.toml").is_file():
-            return d
-        d = d.parent
-    return None
+    fingerprint: List[Any] = [_CACHE_FORMAT]
+    fingerprint += [
+        (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        for path, st in config_sources
+    ]
+    if use_defaults:
+        fingerprint.append(DEFAULTS_DIGEST)
+    key = hashlib.blake2b(repr(fingerprint).encode("utf-8"), digest_size=16).hexdigest()
+    return CONFIG_CACHE_DIR / f"config-{key}.pkl"
+
 
+def _env_refs(value: Any, path: _KeyPath = ()) -> Dict[_KeyPath, str]:
+    """Finds the whole-string `${VAR}` references in the packaged defaults, by key path."""
+    refs: Dict[_KeyPath, str] = {}
+    if isinstance(value, dict):
+        for k, v in value.items():
+            refs.update(_env_refs(v, path + (k,)))
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            refs.update(_env_refs(v, path + (i,)))
+    elif isinstance(value, str):
+        match = ENV_VAR_MATCHER.fullmatch(value)
+        if match:
+            refs[path] = match.group(1)
+    return refs
 
-def find_project_config() -> Optional[Path]:
+
+def _redact_env(merged_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[_KeyPath, str]]:
     """
-    Finds the project-specific configuration file (.aicommit.yaml) in the project root.
+    Copies a merged config with every `EnvValue` blanked out, so that secrets are
+    never written to the cache, and returns it with the variable behind each blanked key path.
     """
-    project_root = find_project_root()
-    if project_root:
-        project_config_path = project_root / PROJECT_CONFIG_FILENAME
-        if project_config_path.is_file():
-            return project_config_path
-    return None
+    env_paths: Dict[_KeyPath, str] = {}
 
+    def redact(value: Any, path: _KeyPath) -> Any:
+        if isinstance(value, dict):
+            return {k: redact(v, path + (k,)) for k, v in value.items()}
+        if isinstance(value, list):
+            return [redact(v, path + (i,)) for i, v in enumerate(value)]
+        if isinstance(value, EnvValue):
+            env_paths[path] = value.name
+            return None
+        return value
 
-def load_and_merge_configs(custom_config_path: Optional[str] = None) -> Config:
+    return redact(merged_config, ()), env_paths
+
+
+def _copy_tree(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(v) for v in value]
+    return value
+
+
+def _restore_env(value: Any, env_paths: Dict[_KeyPath, str], mark: bool = False) -> Any:
     """
-    Loads all configurations (default, user, project) and merges them.
-    A custom config path can be provided to override all others.
+    Returns a fresh copy of `value` with the current value of the given environment
+    variable at each key path (as an `EnvValue` when `mark` is set). Nothing else is
+    substituted, so a literal `"${VAR}"` stays as written.
     """
-    config_paths: List[Path] = []
+    restored = _copy_tree(value)
+    for path, name in env_paths.items():
+        replacement = os.getenv(name)
+        if replacement is None:
+            raise ConfigError(f"Environment variable '{name}' not found for substitution in config.")
+        node = restored
+        for key in path[:-1]:
+            node = node[key]
+        node[path[-1]] = EnvValue(replacement, name) if mark else replacement
+    return restored
 
-    # 1. Default config
-    if DEFAULT_CONFIG_PATH.is_file():
-        config_paths.append(DEFAULT_CONFIG_PATH)
-    else:
-        raise AICommitException("Default configuration file not found.")
 
-    # 2. User config
-    if USER_CONFIG_PATH.is_file():
-        config_paths.append(USER_CONFIG_PATH)
+def _load_cached_config(sources: _SourcesKey, cache_path: Path) -> Optional[Dict[str, Any]]:
+    """Loads a previously merged config, or returns None on a miss."""
+    try:
+        memo = _MERGED_CONFIG_MEMO.get(sources)
+        if memo is not None and memo[0] == cache_path:
+            cached = memo[1]
+        else:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            _MERGED_CONFIG_MEMO[sources] = (cache_path, cached)
+        redacted, env_paths = cached
+        return _restore_env(redacted, env_paths)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Ignoring unusable config cache {}: {}", cache_path, e)
+        return None
+
+
+def _store_cached_config(
+    sources: _SourcesKey,
+    cache_path: Path,
+    redacted: Dict[str, Any],
+    env_paths: Dict[_KeyPath, str],
+):
+    """Remembers and atomically writes the redacted merged config with its environment key paths."""
+    cached = (redacted, env_paths)
+    _MERGED_CONFIG_MEMO[sources] = (cache_path, cached)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=".config-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug("Could not write config cache {}: {}", cache_path, e)
+
 
-    # 3. Project config
-    project_config_path = find_project_config()
-    if project_config_path:
-        config_paths.append(project_config_path)
+def load_and_merge_configs(custom_config_path: Optional[str] = None) -> Config:
+    """
+    Loads all configurations (default, user, project) and merges them.
+    A custom config path can be provided to override all others.
+    """
+    # Each candidate is stat-ed exactly once; the result doubles as the cache fingerprint.
+    config_sources: List[Tuple[Path, os.stat_result]] = []
+    use_defaults = not custom_config_path
 
     # If a custom config path is provided via CLI, it has the highest precedence.
     if custom_config_path:
         path = Path(custom_config_path)
-        if not path.is_file():
+        st = stat_regular_file(path)
+        if st is None:
             raise AICommitException(f"Custom config file not found at: {custom_config_path}")
-        config_paths = [path] # It overrides all others
+        config_sources.append((path, st)) # It overrides all others
         logger.info(f"Using custom configuration from: {custom_config_path}")
+    else:
+        # 1. Default config is the pre-built `DEFAULTS` literal, merged below.
+        # 2. User config
+        st = stat_regular_file(USER_CONFIG_PATH)
+        if st is not None:
+            config_sources.append((USER_CONFIG_PATH, st))
+
+        # 3. Project config
+        project_config_path = find_project_config()
+        if project_config_path:
+            st = stat_regular_file(project_config_path)
+            if st is not None:
+                config_sources.append((project_config_path, st))
+
+    merged_config: Dict[str, Any]
+    if not config_sources:
+        # Defaults only: nothing to parse, so skip both PyYAML and the cache.
+        merged_config = _load_defaults() or {}
+    else:
+        sources = (use_defaults, tuple(os.path.abspath(path) for path, _ in config_sources))
+        cache_path = _config_cache_path(config_sources, use_defaults)
+        cached_config = _load_cached_config(sources, cache_path)
+        if cached_config is not None:
+            logger.debug("Loaded merged configuration from cache: {}", cache_path)
+            merged_config = cached_config
+        else:
+            merged_config = _load_and_cache(sources, cache_path, config_sources, use_defaults)
+
+    try:
+        final_config = _CONFIG_ADAPTER.validate_python(merged_config)
+        # Lazy: only serialized under --verbose or AICOMMIT_DIAG=1, which enable DEBUG records.
+        logger.opt(lazy=True).debug("Final merged config: {}", lambda: final_config.model_dump_json(indent=2))
+        return final_config
+    except Exception as e:
+        raise AICommitException(f"Configuration validation failed: {e}")
+
+
+def _load_defaults(mark: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Returns a fresh copy of the packaged defaults with environment references resolved
+    (as `EnvValue` strings when `mark` is set), or None (after a warning) if a
+    referenced variable is unset.
+    """
+    try:
+        return _restore_env(DEFAULTS, _env_refs(DEFAULTS), mark)
+    except ConfigError as e:
+        logger.warning(f"Could not load default configuration: {e}")
+        return None
+
+
+def _load_and_cache(
+    sources: _SourcesKey,
+    cache_path: Path,
+    config_sources: List[Tuple[Path, os.stat_result]],
+    use_defaults: bool,
+) -> Dict[str, Any]:
+    """Parses and merges the config files, caching the result when every source loaded."""
+    # Imported here so that runs without user or project config never import PyYAML.
+    from config.loader import load_config
 
     merged_config: Dict[str, Any] = {}
-    for path in config_paths:
+    all_loaded = True
+    if use_defaults:
+        defaults = _load_defaults(mark=True)
+        if defaults is None:
+            all_loaded = False
+        else:
+            merged_config = defaults
+
+    for path, _ in config_sources:
         logger.info(f"Loading configuration from: {path}")
         try:
             with open(path, "r") as f:
                 config_data = load_config(f)
                 merged_config = deep_merge(merged_config, config_data)
         except Exception as e:
+            all_loaded = False
             logger.warning(f"Could not load or parse config at {path}: {e}")
 
-    try:
-        final_config = Config(**merged_config)
-        logger.debug(f"Final merged config: {final_config.model_dump_json(indent=2)}")
-        return final_config
-    except Exception as e:
-        raise AICommitException(f"Configuration validation failed: {e}")
+    # Environment values are marked, wherever merging left them; a warm run restores
+    # exactly those keys, so it returns what this cold run does.
+    redacted, env_paths = _redact_env(merged_config)
+    # Only cache complete results, so that a broken file keeps warning on every run.
+    # A malformed `cache` section is left for validation to report, and never cached.
+    cache_section = merged_config.get("cache", {})
+    cache_enabled = isinstance(cache_section, dict) and cache_section.get("enabled", True)
+    if all_loaded and cache_enabled:
+        _store_cached_config(sources, cache_path, redacted, env_paths)
+    return _restore_env(redacted, env_paths)
@@ -9,6 +9,7 @@ class ModelConfig(BaseModel):
     timeout_sec: int = 20
     stream: bool = False
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    rpm: Optional[int] = Field(None, ge=1, description="客户端每分钟请求数上限（目前仅 openai 提供商支持），为空则不限速")
 
 class CollectorConfig(BaseModel):
     type: str
@@ -22,6 +23,7 @@ class OutputConfig(BaseModel):
     language: str = "en"
     max_subject_len: int = 72
     wrap_body_at: int = 100
+    max_diff_chars: Optional[int] = Field(None, ge=1, description="提示词中每个文件 diff 的最大字符数，超出部分截断；为空则不截断")
 
 class CacheConfig(BaseModel):
     enabled: bool = Field(True, description="是否启用缓存")
@@ -38,6 +40,7 @@ class Config(BaseModel):
     model: ModelConfig = Field(default_factory=ModelConfig, description="LLM 模型相关配置")
     formatter: FormatterConfig = Field(default_factory=FormatterConfig, description="格式化器相关配置")
     collectors: List[CollectorConfig] = Field(default_factory=list, description="收集器列表配置")
+    collector_concurrency: int = Field(4, ge=1, description="同时运行的收集器数量上限")
     output: OutputConfig = Field(default_factory=OutputConfig, description="输出相关配置")
     cache: CacheConfig = Field(default_factory=CacheConfig, description="缓存相关配置")
     hook: HookConfig = Field(default_factory=HookConfig, description="Git Hook 相关配置")
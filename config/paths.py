@@ -0,0 +1,45 @@
+import os
+import stat
+from pathlib import Path
+from typing import Optional
+
+# Kept free of pydantic/PyYAML imports, so that the hook fast path can locate config files cheaply.
+USER_CONFIG_DIR = Path.home() / ".aicommit"
+USER_CONFIG_PATH = USER_CONFIG_DIR / "config.yaml"
+PROJECT_CONFIG_FILENAME = ".aicommit.yaml"
+
+
+def find_project_root(start_dir: Path = Path(".")) -> Optional[Path]:
+    """
+    Finds the project root by searching upwards for a .git directory or pyproject.toml.
+    """
+    # Walk with os.path strings rather than pathlib, which allocates a Path per probe.
+    d = os.path.realpath(start_dir)
+    while True:
+        if os.path.isdir(os.path.join(d, ".git")) or os.path.isfile(os.path.join(d, "pyproject.toml")):
+            return Path(d)
+        parent = os.path.dirname(d)
+        if parent == d:
+            return None
+        d = parent
+
+
+def stat_regular_file(path: Path) -> Optional[os.stat_result]:
+    """Returns the stat result of a regular file, or None if there is no such file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def find_project_config() -> Optional[Path]:
+    """
+    Finds the project-specific configuration file (.aicommit.yaml) in the project root.
+    """
+    project_root = find_project_root()
+    if project_root:
+        project_config_path = project_root / PROJECT_CONFIG_FILENAME
+        if stat_regular_file(project_config_path):
+            return project_config_path
+    return None
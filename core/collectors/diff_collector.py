@@ -1,9 +1,10 @@
-from typing import Any, Mapping
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from core.contracts.collector import Collector
+from core.contracts.models import FileChange
 from core.registry import collector_registry
 from utils.errors import CollectorError
-from utils.git import get_staged_diff
+from utils.git import iter_staged_diff_files, staged_file_stats
 
 
 @collector_registry.register("diff")
@@ -12,22 +13,68 @@ class DiffCollector(Collector):
     A collector that retrieves the staged changes from a Git repository.
     """
 
-    def __init__(self, staged_only: bool = True, detect_functions: bool = False):
+    def __init__(self, staged_only: bool = True, detect_functions: bool = False, max_file_lines: Optional[int] = None):
+        """
+        Args:
+            staged_only: Only collect staged changes.
+            detect_functions: Extract function signatures from the diff.
+            max_file_lines: Files with more changed lines (added + deleted) are reported
+                with their line counts only; git never produces their diff. None disables the cap.
+        """
+        if max_file_lines is not None and max_file_lines <= 0:
+            raise ValueError("max_file_lines must be a positive integer.")
         self.staged_only = staged_only
         self.detect_functions = detect_functions
+        self.max_file_lines = max_file_lines
 
     def collect(self) -> Mapping[str, Any]:
         """
         Executes `git diff --cached` to get the staged changes.
 
+        The diff is streamed from git and split into files as it arrives, so
+        large commits are never buffered as one string.
+
         Returns:
-            A mapping containing the git diff output.
+            A mapping containing the staged changes as `FileChange`s, per file.
 
         Raises:
             CollectorError: If the git command fails.
         """
         try:
-            diff = get_staged_diff()
-            return {"diff": diff}
+            if self.max_file_lines is None:
+                sections = list(iter_staged_diff_files())
+            else:
+                sections = self._capped_sections()
+            # Paths and sections come straight from git as str, so skip validation.
+            files = [FileChange.model_construct(path=path, diff=section) for path, section in sections]
+            return {"files": files}
         except Exception as e:
             raise CollectorError(f"Failed to collect git diff: {e}") from e
+
+    def _capped_sections(self) -> List[Tuple[str, str]]:
+        """
+        Diff sections in git's order, with files over `max_file_lines` replaced by a
+        summary; their diff is excluded from the git command instead of being read
+        and dropped later.
+        """
+        stats = staged_file_stats()
+        oversized = {
+            path: (added, deleted, source or path)
+            for path, added, deleted, source in stats
+            if added is not None and added + deleted > self.max_file_lines
+        }
+        # A rename is only detected with both sides in the diff, so exclude its source too.
+        excluded = set(oversized) | {source for _, _, source in oversized.values()}
+        streamed: Dict[str, str] = dict(iter_staged_diff_files(exclude=sorted(excluded)))
+
+        sections: List[Tuple[str, str]] = []
+        for path, _, _, _ in stats:
+            if path in oversized:
+                added, deleted, source = oversized[path]
+                summary = f"diff --git a/{source} b/{path}\n... ({added} additions, {deleted} deletions; diff omitted)"
+                sections.append((path, summary))
+            elif path in streamed:
+                sections.append((path, streamed.pop(path)))
+        # Sections whose header path differs from the stats (e.g. quoted names) keep their diff order.
+        sections.extend(streamed.items())
+        return sections
@@ -4,6 +4,7 @@ from typing import Any, List, Mapping
 from core.contracts.collector import Collector
 from core.registry import collector_registry
 from utils.errors import CollectorError
+from utils.git import git_env
 
 
 @collector_registry.register("history")
@@ -44,6 +45,7 @@ class HistoryCollector(Collector):
                 text=True,
                 check=True,
                 encoding="utf-8",
+                env=git_env(),
             )
             commits = result.stdout.strip("\x00").split("\x00")
             return {"history": [commit.strip() for commit in commits if commit.strip()]}
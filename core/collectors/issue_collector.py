@@ -1,13 +1,15 @@
+import asyncio
 import os
 import re
-from typing import Any, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import httpx
 
 from core.contracts.collector import Collector
 from core.registry import collector_registry
 from utils.errors import CollectorError
-from utils.git import get_current_branch_name, is_git_repository
+from utils.git import get_work_tree_branch
+from utils.http import get_async_client
 from utils.logger import logger
 
 
@@ -26,15 +28,25 @@ class IssueCollector(Collector):
         self.provider = provider
         self.repo = repo
         self.token_env_var = token_env_var
-        self.client = httpx.Client()
+        self._client: Optional[httpx.Client] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        The blocking HTTP client, created on first use.
+        Building a client sets up an SSL context, which `acollect` never needs.
+        """
+        if self._client is None:
+            self._client = httpx.Client()
+        return self._client
 
     def _extract_issue_number(self, branch_name: str) -> Optional[str]:
         """Extracts issue number from branch name (e.g., feature/123-foo -> 123)."""
         match = re.search(r"\d+", branch_name)
         return match.group(0) if match else None
 
-    def _get_github_issue(self, issue_number: str) -> Mapping[str, Any]:
-        """Fetches issue details from GitHub API."""
+    def _github_request(self, issue_number: str) -> Tuple[str, Dict[str, str]]:
+        """Builds the GitHub API URL and headers for an issue."""
         if not self.repo:
             raise CollectorError("GitHub repository (`repo`) not specified in config.")
 
@@ -49,12 +61,13 @@ class IssueCollector(Collector):
             )
 
         url = f"https://api.github.com/repos/{self.repo}/issues/{issue_number}"
+        return url, headers
+
+    def _parse_github_response(self, response: httpx.Response, issue_number: str) -> Mapping[str, Any]:
+        """Turns a GitHub API response into issue details, or {} if the issue does not exist."""
         try:
-            response = self.client.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
-        except httpx.RequestError as e:
-            raise CollectorError(f"Failed to request GitHub API: {e}") from e
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.warning(f"Issue {issue_number} not found in repo {self.repo}.")
@@ -64,6 +77,39 @@ class IssueCollector(Collector):
                 f"{e.response.text}"
             ) from e
 
+    def _get_github_issue(self, issue_number: str) -> Mapping[str, Any]:
+        """Fetches issue details from GitHub API."""
+        url, headers = self._github_request(issue_number)
+        try:
+            response = self.client.get(url, headers=headers)
+        except httpx.RequestError as e:
+            raise CollectorError(f"Failed to request GitHub API: {e}") from e
+        return self._parse_github_response(response, issue_number)
+
+    async def _aget_github_issue(self, issue_number: str) -> Mapping[str, Any]:
+        """Fetches issue details from GitHub API without blocking the event loop."""
+        url, headers = self._github_request(issue_number)
+        try:
+            response = await get_async_client().get(url, headers=headers)
+        except httpx.RequestError as e:
+            raise CollectorError(f"Failed to request GitHub API: {e}") from e
+        return self._parse_github_response(response, issue_number)
+
+    def _find_issue_number(self) -> Optional[str]:
+        """Returns the issue number referenced by the current branch, if any."""
+        branch_name = get_work_tree_branch()
+        if branch_name is None:
+            logger.debug("Not a git repository, skipping issue collection.")
+            return None
+
+        issue_number = self._extract_issue_number(branch_name)
+        if not issue_number:
+            logger.info("No issue number found in branch name, skipping.")
+            return None
+
+        logger.info(f"Found issue number {issue_number} in branch {branch_name}.")
+        return issue_number
+
     def collect(self) -> Mapping[str, Any]:
         """
         Collects issue information based on the current git branch name.
@@ -71,20 +117,11 @@ class IssueCollector(Collector):
         Returns:
             A mapping containing the issue details, or an empty dict if not found.
         """
-        if not is_git_repository():
-            logger.debug("Not a git repository, skipping issue collection.")
-            return {}
-
         try:
-            branch_name = get_current_branch_name()
-            issue_number = self._extract_issue_number(branch_name)
-
+            issue_number = self._find_issue_number()
             if not issue_number:
-                logger.info("No issue number found in branch name, skipping.")
                 return {}
 
-            logger.info(f"Found issue number {issue_number} in branch {branch_name}.")
-
             if self.provider == "github":
                 issue_data = self._get_github_issue(issue_number)
                 return {"issue": issue_data} if issue_data else {}
@@ -94,3 +131,23 @@ class IssueCollector(Collector):
 
         except Exception as e:
             raise CollectorError(f"Failed to collect issue details: {e}") from e
+
+    async def acollect(self) -> Mapping[str, Any]:
+        """
+        Asynchronous variant of `collect`: git lookups run in a worker thread
+        and the GitHub request uses an async client.
+        """
+        try:
+            issue_number = await asyncio.to_thread(self._find_issue_number)
+            if not issue_number:
+                return {}
+
+            if self.provider == "github":
+                issue_data = await self._aget_github_issue(issue_number)
+                return {"issue": issue_data} if issue_data else {}
+            else:
+                logger.warning(f"Provider '{self.provider}' is not supported yet.")
+                return {}
+
+        except Exception as e:
+            raise CollectorError(f"Failed to collect issue details: {e}") from e
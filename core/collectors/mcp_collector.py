@@ -31,3 +31,10 @@ class MCPCollector(Collector):
         # 4. Handle timeouts and errors.
         # 5. Return structured output.
         return {"mcp_data": {}}
+
+    async def acollect(self) -> Mapping[str, Any]:
+        """
+        Native async entry point, so the pipeline never spends a worker thread here.
+        MCP calls are network-bound and belong on the event loop once implemented.
+        """
+        return self.collect()
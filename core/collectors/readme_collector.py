@@ -1,10 +1,53 @@
+import mmap
 import os
-from typing import Any, Mapping
+from typing import Any, Dict, List, Mapping, Tuple
 
 from core.contracts.collector import Collector
 from core.registry import collector_registry
 
 
+# README candidates in order of preference, matched case-insensitively.
+README_FILENAMES = ("readme.md", "readme.rst")
+# README contents by absolute path, with the (st_mtime_ns, st_size) they were read at.
+# Lets long-lived processes such as `aicommit daemon` skip re-reading an unchanged file.
+_README_CACHE: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _read_text(filename: str, size: int) -> str:
+    """
+    Reads a UTF-8 text file of a known size through a read-only memory map,
+    so the content is decoded straight from the page cache without an
+    intermediate read buffer.
+    """
+    if size == 0:
+        return ""  # mmap cannot map an empty file
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, "utf-8")
+    finally:
+        os.close(fd)
+    # Match text-mode reads, which translate \r\n and \r to \n.
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _find_readmes() -> List[os.DirEntry]:
+    """
+    Lists the README candidates in the current directory, most preferred first,
+    with a single directory scan instead of probing every spelling.
+    """
+    found: Dict[str, os.DirEntry] = {}
+    with os.scandir(".") as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            # is_file() is answered from the directory listing on most platforms.
+            if name in README_FILENAMES and name not in found and entry.is_file():
+                found[name] = entry
+    return [found[name] for name in README_FILENAMES if name in found]
+
+
 @collector_registry.register("readme")
 class ReadmeCollector(Collector):
     """
@@ -13,21 +56,34 @@ class ReadmeCollector(Collector):
 
     def collect(self) -> Mapping[str, Any]:
         """
-        Finds and reads README.md or README.rst from the project root.
+        Finds and reads README.md or README.rst (any case) from the project root.
+        A warm call costs one directory scan and one stat.
 
         Returns:
             A mapping containing the README content, or an empty string if not found.
         """
         readme_content = ""
-        for filename in ["README.md", "README.rst"]:
-            if os.path.exists(filename):
-                try:
-                    with open(filename, "r", encoding="utf-8") as f:
-                        readme_content = f.read()
-                    break
-                except Exception:
-                    # If reading fails, we can either log this or just continue.
-                    # For now, we'll just try the next file.
-                    continue
+        try:
+            candidates = _find_readmes()
+        except OSError:
+            candidates = []
+        for entry in candidates:
+            path = os.path.abspath(entry.path)
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            cached = _README_CACHE.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                readme_content = cached[2]
+                break
+            try:
+                readme_content = _read_text(path, st.st_size)
+                _README_CACHE[path] = (st.st_mtime_ns, st.st_size, readme_content)
+                break
+            except Exception:
+                # If reading fails, we can either log this or just continue.
+                # For now, we'll just try the next file.
+                continue
 
         return {"readme": readme_content}
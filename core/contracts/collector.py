@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Mapping, Protocol
 
 
@@ -8,3 +9,12 @@ class Collector(Protocol):
         """Collects information and returns it as a mapping."""
 
         ...
+
+    async def acollect(self) -> Mapping[str, Any]:
+        """
+        Collects information asynchronously.
+
+        The default runs `collect` in a worker thread so that blocking collectors
+        can overlap; I/O-bound collectors should override it with a native implementation.
+        """
+        return await asyncio.to_thread(self.collect)
@@ -1,14 +1,21 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 
 
 class FileChange(BaseModel):
+    # Immutable once split out of the diff; the pipeline builds trusted instances
+    # with `model_construct`, which skips validation.
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     path: str
     diff: str
     language: Optional[str] = None
     functions: Optional[List[str]] = None
 
 class Context(BaseModel):
+    # Collectors may return keys that are not part of the context (e.g. `mcp_data`).
+    model_config = ConfigDict(extra="ignore")
+
     files: List[FileChange] = []
     readme: Optional[str] = None
     recent_commits: List[str] = []
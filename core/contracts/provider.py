@@ -2,7 +2,14 @@ from typing import AsyncIterable, Protocol, Union
 
 
 class LLMProvider(Protocol):
-    """A protocol for LLM providers."""
+    """
+    A protocol for LLM providers.
+
+    `generate` runs on the CLI's event loop (uvloop when installed, see
+    `utils.event_loop`). Providers must not create HTTP clients in `__init__`;
+    they fetch the loop's shared client from `utils.http.get_async_client`
+    inside their coroutines, so connections always belong to the running loop.
+    """
 
     async def generate(
         self, prompt: str, *, stream: bool = False
@@ -1,14 +1,31 @@
 import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 from core.contracts.formatter import Formatter
 from core.contracts.models import Context
 from utils.errors import FormatterError
 
 
+@lru_cache(maxsize=8)
+def _environment(template_dir: str) -> Environment:
+    """
+    Returns the Jinja2 environment for `template_dir`, shared by all formatters,
+    so that formatters built for later runs reuse the templates already compiled.
+    Jinja's auto-reload still recompiles a template whose file has been edited since.
+    """
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    env.globals["now"] = datetime.datetime.now
+    return env
+
+
 class Jinja2Formatter(Formatter):
     def __init__(
         self,
@@ -21,22 +38,17 @@ class Jinja2Formatter(Formatter):
 
         self.template_dir = template_dir
         self.template_name = template_name
+        # Compiled on first use and kept; a formatter only ever renders one template.
+        self._template: Optional[Template] = None
         try:
-            self.env = Environment(
-                loader=FileSystemLoader(self.template_dir),
-                trim_blocks=True,
-                lstrip_blocks=True,
-            )
+            self.env = _environment(self.template_dir)
         except Exception as e:
             raise FormatterError(f"Failed to initialize Jinja2 environment: {e}") from e
 
     def format(self, ctx: Context, model_output: str) -> str:
         try:
-            template = self.env.get_template(self.template_name)
-            return template.render(
-                ctx=ctx,
-                model_output=model_output,
-                now=datetime.datetime.now,
-            )
+            if self._template is None:
+                self._template = self.env.get_template(self.template_name)
+            return self._template.render(ctx=ctx, model_output=model_output)
         except Exception as e:
             raise FormatterError(f"Failed to render template {self.template_name}: {e}") from e
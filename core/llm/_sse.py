@@ -0,0 +1,47 @@
+"""
+Per-token payload parsers for the streaming providers.
+
+Kept as small, fully typed functions so the module can be compiled with mypyc
+(`mypyc core/llm/_sse.py`); the resulting extension module is picked up in place
+of this file automatically, and this pure-Python version remains the fallback.
+"""
+from typing import Optional, Tuple
+
+from utils.jsonlib import loads
+
+
+def parse_openai_delta(data: bytes) -> Optional[str]:
+    """
+    Returns the text content of one OpenAI-compatible chunk, or None for
+    chunks without text (role-only or final deltas) and malformed payloads.
+    """
+    # ValueError covers JSONDecodeError and the stdlib's UnicodeDecodeError on invalid UTF-8.
+    try:
+        content = loads(data)["choices"][0]["delta"]["content"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+    if isinstance(content, str) and content:
+        return content
+    return None
+
+
+def parse_claude_event(data: bytes) -> Tuple[Optional[str], bool]:
+    """
+    Parses one Anthropic Messages stream event.
+
+    Returns:
+        The text of a `text_delta` (or None), and whether the event ends the message.
+    """
+    try:
+        event = loads(data)
+        event_type = event["type"]
+        if event_type == "content_block_delta":
+            delta = event["delta"]
+            if delta["type"] == "text_delta":
+                text = delta["text"]
+                if isinstance(text, str) and text:
+                    return text, False
+            return None, False
+    except (ValueError, KeyError, TypeError):
+        return None, False
+    return None, event_type == "message_stop"
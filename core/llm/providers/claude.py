@@ -1,12 +1,16 @@
 import os
 import httpx
 import json
-from typing import AsyncIterable, Union, AsyncGenerator
+from typing import AsyncIterable, Union, AsyncGenerator, Optional
 
 from core.contracts.provider import LLMProvider
+from core.llm._sse import parse_claude_event
 from config.models import ModelConfig
 from core.registry import provider_registry
 from utils.errors import ProviderError
+from utils.http import get_async_client
+from utils.jsonlib import dumps as fast_json_dumps, loads as fast_json_loads
+from utils.sse import iter_sse_data
 
 @provider_registry.register("claude")
 class ClaudeProvider(LLMProvider):
@@ -14,28 +18,41 @@ class ClaudeProvider(LLMProvider):
     A provider for the Anthropic Claude API, updated for asynchronous operations.
     """
 
-    def __init__(self, config: ModelConfig):
+    def __init__(self, config: ModelConfig, client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self._api_key = config.api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self._api_key:
             raise ProviderError("Anthropic API key not found. Please set it in the config or as an environment variable ANTHROPIC_API_KEY.")
 
-        self._client = httpx.AsyncClient(
-            base_url="https://api.anthropic.com/v1",
-            headers={
-                "x-api-key": self._api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            },
-            timeout=self.config.timeout_sec,
-        )
+        # Requests go through the shared, pooled client of the event loop (utils.http)
+        # unless a client is injected; only the endpoint and credentials belong to the provider.
+        self._client = client
+        self._url = "https://api.anthropic.com/v1/messages"
+        self._headers = {
+            "x-api-key": self._api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        }
+        # The per-request constant part of the payload; additional parameters
+        # may override 'max_tokens'.
+        self._base_payload = {
+            "model": self.config.name,
+            "max_tokens": 4096,  # Anthropic requires max_tokens
+            **self.config.parameters,
+        }
+
+    def _http(self) -> httpx.AsyncClient:
+        """Returns the injected client, or the shared client of the running event loop."""
+        return self._client or get_async_client()
 
     async def _request(self, payload: dict) -> httpx.Response:
         """
         Sends an HTTP request to the Claude API.
         """
         try:
-            response = await self._client.post("/messages", json=payload)
+            response = await self._http().post(
+                self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+            )
             response.raise_for_status()
             return response
         except httpx.TimeoutException as e:
@@ -54,14 +71,10 @@ class ClaudeProvider(LLMProvider):
         """
         Builds the request payload for the API.
         """
-        payload = {
-            "model": self.config.name,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 4096,  # Anthropic requires max_tokens
-            "stream": stream,
-        }
-        # Merge additional parameters, ensuring 'max_tokens' is not overwritten if present
-        payload.update(self.config.parameters)
+        # dict.copy() is a single C-level copy, cheaper than re-merging with **.
+        payload = self._base_payload.copy()
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["stream"] = stream
         return payload
 
     async def _process_stream(self, response: httpx.Response) -> AsyncGenerator[str, None]:
@@ -69,26 +82,14 @@ class ClaudeProvider(LLMProvider):
         Processes a streaming response from the Claude API.
         """
         try:
-            async for line in response.aiter_lines():
-                line = line.strip()
-                if not line.startswith("data:"):
-                    continue
-                data_str = line[len("data:"):].strip()
-                if not data_str:
-                    continue
-                try:
-                    chunk = json.loads(data_str)
-                    chunk_type = chunk.get("type")
-                    if chunk_type == "content_block_delta":
-                        delta = chunk.get("delta", {})
-                        if delta.get("type") == "text_delta":
-                            content = delta.get("text")
-                            if content:
-                                yield content
-                    elif chunk_type == "message_stop":
-                        break
-                except (json.JSONDecodeError, IndexError):
+            async for data in iter_sse_data(response.aiter_bytes()):
+                if not data:
                     continue
+                content, is_stop = parse_claude_event(data)
+                if content:
+                    yield content
+                elif is_stop:
+                    break
         finally:
             await response.aclose()
 
@@ -101,20 +102,24 @@ class ClaudeProvider(LLMProvider):
         if stream:
             async def stream_generator():
                 try:
-                    async with self._client.stream("POST", "/messages", json=payload) as response:
+                    async with self._http().stream(
+                        "POST", self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+                    ) as response:
+                        if response.is_error:
+                            # Buffer the error body now: it cannot be read once the stream is closed.
+                            await response.aread()
                         response.raise_for_status()
                         async for chunk in self._process_stream(response):
                             yield chunk
                 except httpx.HTTPStatusError as e:
-                    error_body = await e.response.aread()
                     try:
-                        error_details = json.loads(error_body)
-                        error_message = error_details.get("error", {}).get("message", error_body.decode())
+                        error_details = fast_json_loads(e.response.content)
+                        error_message = error_details.get("error", {}).get("message", e.response.text)
                     except json.JSONDecodeError:
-                        error_message = error_body.decode()
+                        error_message = e.response.text
                     raise ProviderError(f"Anthropic API error ({e.response.status_code}): {error_message}") from e
             return stream_generator()
         else:
             response = await self._request(payload)
-            data = response.json()
+            data = fast_json_loads(response.content)
             return data.get("content", [{}])[0].get("text", "")
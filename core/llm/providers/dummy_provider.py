@@ -1,5 +1,6 @@
 from typing import AsyncIterable, Union
 import asyncio
+import re
 
 from core.contracts.provider import LLMProvider
 from config.models import ModelConfig
@@ -10,18 +11,23 @@ from core.registry import provider_registry
 class DummyProvider(LLMProvider):
     """A dummy provider for testing purposes that adheres to the async contract."""
 
-    def __init__(self, config: ModelConfig, response: str = "test response"):
+    def __init__(self, config: ModelConfig, response: str = "test response", simulate_latency: bool = False):
         self.config = config
         self._response = response
+        # Word tokens keep their trailing whitespace, so joined chunks equal the response.
+        self._tokens = tuple(re.findall(r"\S+\s*", response))
+        self._simulate_latency = simulate_latency
 
     async def generate(self, prompt: str, *, stream: bool = False) -> Union[str, AsyncIterable[str]]:
         """Returns a dummy response, either as a string or an async iterable."""
         if stream:
             async def stream_generator():
-                for word in self._response.split():
-                    yield word
-                    await asyncio.sleep(0.05) # Simulate network delay
+                for token in self._tokens:
+                    yield token
+                    if self._simulate_latency:
+                        await asyncio.sleep(0.05) # Simulate network delay
             return stream_generator()
 
-        await asyncio.sleep(0.1) # Simulate network delay
+        if self._simulate_latency:
+            await asyncio.sleep(0.1) # Simulate network delay
         return self._response
@@ -1,12 +1,16 @@
 import os
 import httpx
 import json
-from typing import AsyncIterable, Union, AsyncGenerator
+from typing import AsyncIterable, Union, AsyncGenerator, Optional
 
 from core.contracts.provider import LLMProvider
+from core.llm._sse import parse_openai_delta
 from config.models import ModelConfig
 from core.registry import provider_registry
 from utils.errors import ProviderError
+from utils.http import get_async_client
+from utils.jsonlib import dumps as fast_json_dumps, loads as fast_json_loads
+from utils.sse import DONE_SENTINEL, iter_sse_data
 
 @provider_registry.register("local")
 class LocalProvider(LLMProvider):
@@ -14,28 +18,36 @@ class LocalProvider(LLMProvider):
     A provider for local OpenAI-compatible APIs (like Ollama), updated for async.
     """
 
-    def __init__(self, config: ModelConfig):
+    def __init__(self, config: ModelConfig, client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self._api_key = config.api_key or os.getenv("LOCAL_API_KEY", "ollama")
         self._base_url = config.base_url or os.getenv("OLLAMA_BASE_URL")
         if not self._base_url:
             raise ProviderError("Local provider requires a `base_url` to be set in the config.")
 
-        self._client = httpx.AsyncClient(
-            base_url=self._base_url,
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=self.config.timeout_sec,
-        )
+        # Requests go through the shared, pooled client of the event loop (utils.http)
+        # unless a client is injected; only the endpoint and credentials belong to the provider.
+        self._client = client
+        self._url = f"{self._base_url.rstrip('/')}/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        # The per-request constant part of the payload.
+        self._base_payload = {"model": self.config.name, **self.config.parameters}
+
+    def _http(self) -> httpx.AsyncClient:
+        """Returns the injected client, or the shared client of the running event loop."""
+        return self._client or get_async_client()
 
     async def _request(self, payload: dict) -> httpx.Response:
         """
         Sends an HTTP request.
         """
         try:
-            response = await self._client.post("/chat/completions", json=payload)
+            response = await self._http().post(
+                self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+            )
             response.raise_for_status()
             return response
         except httpx.TimeoutException as e:
@@ -54,33 +66,25 @@ class LocalProvider(LLMProvider):
         """
         Builds the request payload.
         """
-        return {
-            "model": self.config.name,
-            "messages": [{"role": "user", "content": prompt}],
-            "stream": stream,
-            **self.config.parameters,
-        }
+        # dict.copy() is a single C-level copy, cheaper than re-merging with **.
+        payload = self._base_payload.copy()
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["stream"] = stream
+        return payload
 
     async def _process_stream(self, response: httpx.Response) -> AsyncGenerator[str, None]:
         """
         Processes a streaming response.
         """
         try:
-            async for line in response.aiter_lines():
-                if line.startswith("data:"):
-                    chunk_str = line[len("data:"):].strip()
-                    if chunk_str == "[DONE]":
-                        break
-                    if not chunk_str:
-                        continue
-                    try:
-                        chunk = json.loads(chunk_str)
-                        delta = chunk.get("choices", [{}])[0].get("delta", {})
-                        content = delta.get("content")
-                        if content:
-                            yield content
-                    except (json.JSONDecodeError, IndexError):
-                        continue
+            async for chunk_data in iter_sse_data(response.aiter_bytes()):
+                if chunk_data == DONE_SENTINEL:
+                    break
+                if not chunk_data:
+                    continue
+                content = parse_openai_delta(chunk_data)
+                if content:
+                    yield content
         finally:
             await response.aclose()
 
@@ -93,20 +97,24 @@ class LocalProvider(LLMProvider):
         if stream:
             async def stream_generator():
                 try:
-                    async with self._client.stream("POST", "/chat/completions", json=payload) as response:
+                    async with self._http().stream(
+                        "POST", self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+                    ) as response:
+                        if response.is_error:
+                            # Buffer the error body now: it cannot be read once the stream is closed.
+                            await response.aread()
                         response.raise_for_status()
                         async for chunk in self._process_stream(response):
                             yield chunk
                 except httpx.HTTPStatusError as e:
-                    error_body = await e.response.aread()
                     try:
-                        error_details = json.loads(error_body)
-                        error_message = error_details.get("error", {}).get("message", error_body.decode())
+                        error_details = fast_json_loads(e.response.content)
+                        error_message = error_details.get("error", {}).get("message", e.response.text)
                     except json.JSONDecodeError:
-                        error_message = error_body.decode()
+                        error_message = e.response.text
                     raise ProviderError(f"Local provider API error ({e.response.status_code}): {error_message}") from e
             return stream_generator()
         else:
             response = await self._request(payload)
-            data = response.json()
+            data = fast_json_loads(response.content)
             return data["choices"][0]["message"]["content"]
@@ -1,12 +1,17 @@
 import os
 import httpx
 import json
-from typing import AsyncIterable, Union, AsyncGenerator
+from typing import AsyncIterable, Union, AsyncGenerator, Optional
 
 from core.contracts.provider import LLMProvider
+from core.llm._sse import parse_openai_delta
 from config.models import ModelConfig
 from core.registry import provider_registry
 from utils.errors import ProviderError
+from utils.http import get_async_client
+from utils.jsonlib import dumps as fast_json_dumps, loads as fast_json_loads
+from utils.ratelimit import TokenBucket
+from utils.sse import DONE_SENTINEL, iter_sse_data
 
 
 @provider_registry.register("openai")
@@ -15,29 +20,51 @@ class OpenAIProvider(LLMProvider):
     A provider for OpenAI's API, updated for asynchronous operations.
     """
 
-    def __init__(self, config: ModelConfig):
+    def __init__(self, config: ModelConfig, client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self._api_key = config.api_key or os.getenv("OPENAI_API_KEY")
         if not self._api_key:
             raise ProviderError("OpenAI API key not found. Please set it in the config or as an environment variable OPENAI_API_KEY.")
 
-        self._client = httpx.AsyncClient(
-            base_url="https://api.openai.com/v1",
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=self.config.timeout_sec,
-        )
+        # Requests go through the shared, pooled client of the event loop (utils.http)
+        # unless a client is injected; only the endpoint and credentials belong to the provider.
+        self._client = client
+        self._url = "https://api.openai.com/v1/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        # The per-request constant part of the payload.
+        self._base_payload = {"model": self.config.name, **self.config.parameters}
+        # Throttle before sending when an RPM limit is configured, instead of paying
+        # a round trip for every 429. Providers are reused per config (core.llm.router),
+        # so the bucket spans all requests of a process.
+        self._bucket = TokenBucket.per_minute(config.rpm) if config.rpm else None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Returns the injected client, or the shared client of the running event loop."""
+        return self._client or get_async_client()
+
+    async def _throttle(self) -> None:
+        if self._bucket is not None:
+            await self._bucket.acquire()
+
+    def _on_status_error(self, status_code: int) -> None:
+        if status_code == 429 and self._bucket is not None:
+            self._bucket.slow_down()
 
     async def _request(self, payload: dict) -> httpx.Response:
+        await self._throttle()
         try:
-            response = await self._client.post("/chat/completions", json=payload)
+            response = await self._http().post(
+                self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+            )
             response.raise_for_status()
             return response
         except httpx.TimeoutException as e:
             raise ProviderError(f"Request to OpenAI timed out: {e}") from e
         except httpx.HTTPStatusError as e:
+            self._on_status_error(e.response.status_code)
             try:
                 error_details = e.response.json()
                 error_message = error_details.get("error", {}).get("message", e.response.text)
@@ -48,31 +75,23 @@ class OpenAIProvider(LLMProvider):
             raise ProviderError(f"An unexpected network error occurred: {e}") from e
 
     def _build_payload(self, prompt: str, stream: bool) -> dict:
-        return {
-            "model": self.config.name,
-            "messages": [{"role": "user", "content": prompt}],
-            "stream": stream,
-            **self.config.parameters,
-        }
+        # dict.copy() is a single C-level copy, cheaper than re-merging with **.
+        payload = self._base_payload.copy()
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["stream"] = stream
+        return payload
 
     async def _process_stream(self, response: httpx.Response) -> AsyncGenerator[str, None]:
         """Processes a streaming response from the OpenAI API."""
         try:
-            async for line in response.aiter_lines():
-                if line.startswith("data:"):
-                    chunk_str = line[len("data:"):].strip()
-                    if chunk_str == "[DONE]":
-                        break
-                    if not chunk_str:
-                        continue
-                    try:
-                        chunk = json.loads(chunk_str)
-                        delta = chunk.get("choices", [{}])[0].get("delta", {})
-                        content = delta.get("content")
-                        if content:
-                            yield content
-                    except (json.JSONDecodeError, IndexError):
-                        continue
+            async for chunk_data in iter_sse_data(response.aiter_bytes()):
+                if chunk_data == DONE_SENTINEL:
+                    break
+                if not chunk_data:
+                    continue
+                content = parse_openai_delta(chunk_data)
+                if content:
+                    yield content
         finally:
             await response.aclose()
 
@@ -84,23 +103,29 @@ class OpenAIProvider(LLMProvider):
 
         if stream:
             async def stream_generator():
+                await self._throttle()
                 try:
-                    async with self._client.stream("POST", "/chat/completions", json=payload) as response:
+                    async with self._http().stream(
+                        "POST", self._url, content=fast_json_dumps(payload), headers=self._headers, timeout=self.config.timeout_sec
+                    ) as response:
+                        if response.is_error:
+                            # Buffer the error body now: it cannot be read once the stream is closed.
+                            await response.aread()
                         response.raise_for_status()
                         async for chunk in self._process_stream(response):
                             yield chunk
                 except httpx.HTTPStatusError as e:
                     # Handle case where the error happens during stream setup
-                    error_body = await e.response.aread()
+                    self._on_status_error(e.response.status_code)
                     try:
-                        error_details = json.loads(error_body)
-                        error_message = error_details.get("error", {}).get("message", error_body.decode())
+                        error_details = fast_json_loads(e.response.content)
+                        error_message = error_details.get("error", {}).get("message", e.response.text)
                     except json.JSONDecodeError:
-                        error_message = error_body.decode()
+                        error_message = e.response.text
                     raise ProviderError(f"OpenAI API error ({e.response.status_code}): {error_message}") from e
 
             return stream_generator()
         else:
             response = await self._request(payload)
-            data = response.json()
+            data = fast_json_loads(response.content)
             return data["choices"][0]["message"]["content"]
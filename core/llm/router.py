@@ -1,8 +1,29 @@
+from functools import lru_cache
+from typing import Type
+
 from config.models import ModelConfig
 from core.contracts.provider import LLMProvider
 from core.registry import provider_registry
 from utils.errors import ProviderError
 
+
+@lru_cache(maxsize=8)
+def _create_provider(provider_cls: Type[LLMProvider], config_json: str) -> LLMProvider:
+    """Instantiates a provider once per class and (serialized) model configuration."""
+    return provider_cls(config=ModelConfig.model_validate_json(config_json))
+
+
+def cached_provider(provider_cls: Type[LLMProvider], config: ModelConfig) -> LLMProvider:
+    """
+    Returns a shared instance of `provider_cls` for `config`.
+
+    Providers keep no per-request state (HTTP connections live in the shared
+    client of `utils.http`), so one instance can serve every pipeline run with
+    the same model configuration, e.g. across commits handled by the daemon.
+    """
+    return _create_provider(provider_cls, config.model_dump_json())
+
+
 def get_provider(config: ModelConfig) -> LLMProvider:
     """
     Factory function to get an LLM provider instance based on the config.
@@ -18,8 +39,7 @@ def get_provider(config: ModelConfig) -> LLMProvider:
     """
     try:
         # The provider's __init__ is expected to take the config object.
-        provider_instance = provider_registry.create(config.provider, config=config)
-        return provider_instance
+        return cached_provider(provider_registry.get(config.provider), config)
     except KeyError:
         available = list(provider_registry.keys())
         raise ProviderError(
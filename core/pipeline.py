@@ -1,17 +1,65 @@
 import asyncio
-from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Mapping, Union
+import hashlib
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
-from config.models import Config
+from config.models import CollectorConfig, Config
 from core.contracts.collector import Collector
 from core.contracts.formatter import Formatter
-from core.contracts.models import Context
+from core.contracts.models import Context, FileChange
 from core.contracts.provider import LLMProvider
 from core.formatter.jinja_formatter import Jinja2Formatter
+from core.llm.router import cached_provider
 from core.registry import collector_registry, provider_registry
 from utils.cache import Cache
 from utils.errors import CollectorError, FormatterError, ProviderError
+from utils.git import split_diff_by_file
 from utils.logger import logger
 
+# This is a basic prompt template. It could be moved to a configuration file
+# or a more sophisticated templating system in the future.
+PROMPT_TEMPLATE = """
+You are an expert at writing git commit messages.
+Your task is to write a commit message for the following changes.
+
+The commit message must follow the Conventional Commits specification.
+The output language should be {language}.
+
+Here is the context for the changes:
+{context_summary}
+
+And here are the file-by-file changes (diffs):
+{diffs}
+
+Please generate a concise and informative commit message.
+Do not include any extra text or explanations, only the commit message itself.
+"""
+
+# The template split around its per-run placeholders; only the head depends on the config.
+_PROMPT_HEAD, _rest = PROMPT_TEMPLATE.split("{context_summary}")
+_PROMPT_MIDDLE, _PROMPT_TAIL = _rest.split("{diffs}")
+del _rest
+_TRUNCATION_MARKER = "\n... (diff truncated)"
+
+
+def _file_sort_key(file: FileChange) -> Tuple[str, str]:
+    return file.path, file.diff
+
+
+_NATIVE_ACOLLECT = "acollect"
+_COROUTINE_COLLECT = "async collect"
+_BLOCKING_COLLECT = "blocking collect"
+
+
+@lru_cache(maxsize=32)
+def _collector_kind(collector_cls: Any) -> str:
+    """Classifies how a collector class is run; the reflection happens once per class."""
+    if getattr(collector_cls, "acollect", Collector.acollect) is not Collector.acollect:
+        return _NATIVE_ACOLLECT
+    if asyncio.iscoroutinefunction(collector_cls.collect):
+        return _COROUTINE_COLLECT
+    return _BLOCKING_COLLECT
+
 
 class CommitMessageGenerator:
     """
@@ -31,6 +79,11 @@ class CommitMessageGenerator:
             cache_dir=self.config.cache.directory,
             ttl_sec=self.config.cache.ttl_sec
         ) if self.config.cache.enabled else None
+        # Fixed once the cache is set up (it disables itself if its directory is unusable).
+        self._cache_enabled = self.cache is not None and self.cache.is_enabled()
+        self._prompt_head = _PROMPT_HEAD.format(language=self.config.output.language)
+        # Created on first use, so that setup errors surface as FormatterError while formatting.
+        self._formatter: Optional[Formatter] = None
 
     async def generate(self, stream: bool = False) -> Union[str, AsyncGenerator[str, None]]:
         """
@@ -45,15 +98,7 @@ class CommitMessageGenerator:
         """
         logger.info("Starting commit message generation pipeline...")
         # 1. Collect context (applies to both modes)
-        try:
-            context_data = await self._collect_context()
-            logger.info(f"Collected context data: {list(context_data.keys())}")
-        except CollectorError as e:
-            logger.error(f"Failed to collect context: {e}", exc_info=True)
-            raise  # Re-raise to be handled by the CLI
-
-        context = self._aggregate_context(context_data)
-        logger.debug(f"Aggregated context: {context.model_dump_json(indent=2)}")
+        context = await self._build_context()
 
         # 2. Generate raw message from LLM (with caching)
         try:
@@ -68,63 +113,179 @@ class CommitMessageGenerator:
             return raw_message_or_stream
         else:
             # 4. Format the final message for non-streaming mode
-            try:
-                formatted_message = self._format_message(context, raw_message_or_stream)
-                logger.info("Successfully formatted the commit message.")
-                logger.success("Commit message generation pipeline completed successfully!")
-                return formatted_message
-            except FormatterError as e:
-                logger.error(f"Failed to format message: {e}", exc_info=True)
-                raise
+            return self._finalize_message(context, raw_message_or_stream)
+
+    async def generate_streaming(self, on_chunk: Callable[[str], None]) -> str:
+        """
+        Generates a commit message, forwarding the raw model output to `on_chunk`
+        as it arrives. Unlike `generate(stream=True)`, the result is cached and
+        formatted like a non-streaming run.
+
+        Args:
+            on_chunk: Called with each chunk of raw model output, in order.
+                On a cache hit it is called once with the whole cached message.
+
+        Returns:
+            The complete, formatted commit message.
+        """
+        logger.info("Starting streaming commit message generation pipeline...")
+        context = await self._build_context()
+
+        try:
+            raw_message = await self._stream_raw_message(context, on_chunk)
+        except ProviderError as e:
+            logger.error(f"Failed to generate message from provider: {e}", exc_info=True)
+            raise
+
+        return self._finalize_message(context, raw_message)
+
+    async def generate_many(self, contexts: Sequence[Context]) -> List[str]:
+        """
+        Generates a formatted commit message for each of several prepared contexts,
+        e.g. when drafting messages for a series of commits.
+
+        All provider requests are in flight at once and share the pooled client of
+        the event loop (multiplexed over one connection when HTTP/2 is available),
+        so the batch costs about one round trip instead of one per context.
+        Cache hits are served without a request.
+
+        Args:
+            contexts: The contexts to generate messages for.
+
+        Returns:
+            The formatted messages, in the order of `contexts`.
+        """
+        logger.info(f"Generating {len(contexts)} commit messages concurrently...")
+        try:
+            raw_messages = await asyncio.gather(
+                *(self._generate_raw_message(context) for context in contexts)
+            )
+        except ProviderError as e:
+            logger.error(f"Failed to generate message from provider: {e}", exc_info=True)
+            raise
+        return [
+            self._finalize_message(context, raw_message)
+            for context, raw_message in zip(contexts, raw_messages)
+        ]
+
+    async def _build_context(self) -> Context:
+        """Runs the collectors and aggregates their output into a Context."""
+        try:
+            context_data = await self._collect_context()
+            logger.info(f"Collected context data: {list(context_data.keys())}")
+        except CollectorError as e:
+            logger.error(f"Failed to collect context: {e}", exc_info=True)
+            raise  # Re-raise to be handled by the CLI
+
+        context = self._aggregate_context(context_data)
+        # Serializing every diff is costly; only done under --verbose or AICOMMIT_DIAG=1.
+        logger.opt(lazy=True).debug("Aggregated context: {}", lambda: context.model_dump_json(indent=2))
+        return context
+
+    def _finalize_message(self, context: Context, raw_message: str) -> str:
+        """Formats the raw model output, logging the outcome."""
+        try:
+            formatted_message = self._format_message(context, raw_message)
+            logger.info("Successfully formatted the commit message.")
+            logger.success("Commit message generation pipeline completed successfully!")
+            return formatted_message
+        except FormatterError as e:
+            logger.error(f"Failed to format message: {e}", exc_info=True)
+            raise
 
     async def _collect_context(self) -> Dict[str, Any]:
         """
-        Runs all configured collectors to gather context.
+        Runs all configured collectors concurrently to gather context.
+        At most `config.collector_concurrency` collectors run at the same time.
         """
         logger.info(f"Running {len(self.config.collectors)} collectors...")
-        tasks = []
-        for collector_config in self.config.collectors:
-            try:
-                collector_cls = collector_registry.get(collector_config.type)
-                collector: Collector = collector_cls(**collector_config.options)
-                if asyncio.iscoroutinefunction(collector.collect):
-                    tasks.append(asyncio.create_task(collector.collect()))
-                else:
-                    tasks.append(asyncio.to_thread(collector.collect))
-            except KeyError:
-                raise CollectorError(f"Collector '{collector_config.type}' not found in registry.")
-            except Exception as e:
-                raise CollectorError(f"Failed to instantiate or run collector '{collector_config.type}': {e}")
+        semaphore = asyncio.Semaphore(self.config.collector_concurrency)
+        tasks: List["asyncio.Task[Mapping[str, Any]]"] = []
+        try:
+            for collector_config in self.config.collectors:
+                try:
+                    collector_cls = collector_registry.get(collector_config.type)
+                except KeyError:
+                    raise CollectorError(f"Collector '{collector_config.type}' not found in registry.")
+                # Start each collector right away; construction happens inside the task,
+                # so a constructor that blocks does not hold up the event loop.
+                tasks.append(asyncio.create_task(
+                    self._run_collector(collector_cls, collector_config, semaphore)
+                ))
+        except CollectorError:
+            for task in tasks:
+                task.cancel()
+            raise
 
         results: List[Mapping[str, Any]] = await asyncio.gather(*tasks)
 
+        # Later collectors win for keys they set; empty values never overwrite.
         combined_data: Dict[str, Any] = {}
         for data in results:
-            for key, value in data.items():
-                if value:
-                    combined_data[key] = value
+            combined_data.update([(key, value) for key, value in data.items() if value])
         return combined_data
 
+    @staticmethod
+    def _instantiate_collector(collector_cls: Any, collector_config: CollectorConfig) -> Collector:
+        try:
+            return collector_cls(**collector_config.options)
+        except Exception as e:
+            raise CollectorError(f"Failed to instantiate or run collector '{collector_config.type}': {e}")
+
+    @classmethod
+    def _instantiate_and_collect(cls, collector_cls: Any, collector_config: CollectorConfig) -> Mapping[str, Any]:
+        return cls._instantiate_collector(collector_cls, collector_config).collect()
+
+    @classmethod
+    async def _run_collector(
+        cls, collector_cls: Any, collector_config: CollectorConfig, semaphore: asyncio.Semaphore
+    ) -> Mapping[str, Any]:
+        """
+        Instantiates and runs a single collector under the concurrency limit.
+        Collectors that only implement a blocking `collect` (or inherit the default
+        `acollect`) are constructed and run in a single worker-thread hop.
+        """
+        kind = _collector_kind(collector_cls)
+        async with semaphore:
+            if kind == _NATIVE_ACOLLECT:
+                return await cls._instantiate_collector(collector_cls, collector_config).acollect()
+            if kind == _COROUTINE_COLLECT:
+                return await cls._instantiate_collector(collector_cls, collector_config).collect()
+            return await asyncio.to_thread(cls._instantiate_and_collect, collector_cls, collector_config)
+
     def _aggregate_context(self, context_data: Dict[str, Any]) -> Context:
         """
         Aggregates data from collectors into a single Context object.
+        Raw collector outputs (`diff`, `history`, `issue`) are mapped onto
+        the corresponding Context fields unless a collector already set them.
         """
         logger.info("Aggregating collector data into Context object.")
-        return Context(**context_data)
+        data = dict(context_data)
+        if "diff" in data and "files" not in data:
+            # Paths and sections come straight from git as str, so skip validation.
+            data["files"] = [
+                FileChange.model_construct(path=path, diff=section)
+                for path, section in split_diff_by_file(data.pop("diff"))
+            ]
+        if "history" in data and "recent_commits" not in data:
+            data["recent_commits"] = data.pop("history")
+        if "issue" in data and "issues" not in data:
+            data["issues"] = [data.pop("issue")]
+        return Context(**data)
 
     async def _call_provider(self, context: Context, stream: bool) -> Union[str, AsyncIterable[str]]:
         """The actual logic to call the LLM provider."""
         logger.info(f"Calling LLM provider '{self.config.model.provider}'...")
         try:
             provider_cls = provider_registry.get(self.config.model.provider)
-            provider: LLMProvider = provider_cls(config=self.config.model)
+            provider: LLMProvider = cached_provider(provider_cls, self.config.model)
         except KeyError:
             raise ProviderError(f"Provider '{self.config.model.provider}' not found in registry.")
         except Exception as e:
             raise ProviderError(f"Failed to instantiate provider '{self.config.model.provider}': {e}")
 
         prompt = self._create_prompt(context)
-        logger.debug(f"Generated prompt for LLM:\n{prompt}")
+        logger.debug("Generated prompt for LLM:\n{}", prompt)
 
         response = await provider.generate(prompt, stream=stream)
         return response
@@ -134,18 +295,18 @@ class CommitMessageGenerator:
         Generates the raw commit message using the LLM provider, with caching.
         Caching is bypassed for streaming requests.
         """
-        if stream or not self.cache or not self.cache.is_enabled():
+        if stream or not self._cache_enabled:
             return await self._call_provider(context, stream)
 
-        # Create a stable string from the diffs to use as a cache key.
+        # Create a stable digest of the diffs to use as a cache key.
         # It's important that this is deterministic.
         if not context.files:
             # If there are no files, we can't generate a diff-based cache key.
             return await self._call_provider(context, stream=False)
 
-        diff_content = "\n---\n".join(sorted(f.diff for f in context.files))
+        cache_key = self._cache_key_content(context)
 
-        cached_message = self.cache.get(diff_content)
+        cached_message = self.cache.get(cache_key)
         if cached_message:
             logger.info("Cache hit. Returning cached raw message.")
             return cached_message
@@ -154,47 +315,77 @@ class CommitMessageGenerator:
         raw_message = await self._call_provider(context, stream=False)
 
         if isinstance(raw_message, str):
-            self.cache.set(diff_content, raw_message)
+            self.cache.set(cache_key, raw_message)
+
+        return raw_message
 
+    async def _stream_raw_message(self, context: Context, on_chunk: Callable[[str], None]) -> str:
+        """
+        Streams the raw commit message from the provider into `on_chunk`,
+        serving and filling the cache like `_generate_raw_message`.
+        """
+        cache_key = None
+        if self._cache_enabled and context.files:
+            cache_key = self._cache_key_content(context)
+            cached_message = self.cache.get(cache_key)
+            if cached_message:
+                logger.info("Cache hit. Returning cached raw message.")
+                on_chunk(cached_message)
+                return cached_message
+
+        chunks: List[str] = []
+        stream = await self._call_provider(context, stream=True)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                on_chunk(chunk)
+        finally:
+            # Close the provider's generator right away if we stop early, so that its
+            # `async with client.stream(...)` block releases the connection to the pool.
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        raw_message = "".join(chunks)
+
+        if cache_key and raw_message:
+            self.cache.set(cache_key, raw_message)
         return raw_message
 
+    def _cache_key_content(self, context: Context) -> str:
+        """
+        Builds the cache key content: a digest of the staged diffs plus every
+        setting that changes the raw model output for the same diff.
+        The diffs are hashed one by one instead of being joined into one large string.
+        """
+        model = self.config.model
+        digest = hashlib.blake2b(digest_size=16)
+        output = self.config.output
+        digest.update(f"{model.provider}\n{model.name}\n{output.language}\n{output.max_diff_chars}".encode("utf-8"))
+        # Paths are unique per diff, so ordering by them is as stable as ordering by content.
+        for file in sorted(context.files, key=_file_sort_key):
+            digest.update(b"\n---\n")
+            digest.update(file.diff.encode("utf-8"))
+        return digest.hexdigest()
+
     def _format_message(self, context: Context, model_output: str) -> str:
         """
         Formats the raw model output into the final commit message.
         """
         logger.info("Formatting final commit message.")
-        # For now, we only have one formatter type, so we instantiate it directly.
-        # This could be extended to use a registry if more formatters are added.
-        formatter: Formatter = Jinja2Formatter(
-            template_dir=self.config.formatter.template_dir,
-            template_name=self.config.formatter.template,
-        )
-        return formatter.format(context, model_output)
+        if self._formatter is None:
+            # For now, we only have one formatter type, so we instantiate it directly.
+            # This could be extended to use a registry if more formatters are added.
+            # Kept for the generator's lifetime, so the template is compiled once.
+            self._formatter = Jinja2Formatter(
+                template_dir=self.config.formatter.template_dir,
+                template_name=self.config.formatter.template,
+            )
+        return self._formatter.format(context, model_output)
 
     def _create_prompt(self, context: Context) -> str:
         """
         Creates the prompt to be sent to the LLM.
         """
-        # This is a basic prompt template. It could be moved to a configuration file
-        # or a more sophisticated templating system in the future.
-
-        prompt_template = """
-You are an expert at writing git commit messages.
-Your task is to write a commit message for the following changes.
-
-The commit message must follow the Conventional Commits specification.
-The output language should be {language}.
-
-Here is the context for the changes:
-{context_summary}
-
-And here are the file-by-file changes (diffs):
-{diffs}
-
-Please generate a concise and informative commit message.
-Do not include any extra text or explanations, only the commit message itself.
-"""
-
         context_summary_parts = []
         if context.readme:
             context_summary_parts.append(f"README Summary:\n{context.readme[:500]}...") # Truncate for prompt
@@ -205,15 +396,23 @@ Do not include any extra text or explanations, only the commit message itself.
             issues_str = "\n".join(f"- {i.get('title', 'N/A')}" for i in context.issues)
             context_summary_parts.append(f"Related Issues:\n{issues_str}")
 
-        context_summary = "\n\n".join(context_summary_parts)
-
-        diffs = "\n\n".join(
-            f"File: {file.path}\n```diff\n{file.diff}\n```"
-            for file in context.files
-        )
-
-        return prompt_template.format(
-            language=self.config.output.language,
-            context_summary=context_summary if context_summary_parts else "No additional context provided.",
-            diffs=diffs
-        )
+        # Assembled with a single join: the diffs are the bulk of the prompt, and
+        # str.format would copy them once more into the final string.
+        parts = [
+            self._prompt_head,
+            "\n\n".join(context_summary_parts) if context_summary_parts else "No additional context provided.",
+            _PROMPT_MIDDLE,
+        ]
+        max_diff_chars = self.config.output.max_diff_chars
+        for index, file in enumerate(context.files):
+            if index:
+                parts.append("\n\n")
+            parts += ("File: ", file.path, "\n```diff\n")
+            if max_diff_chars is not None and len(file.diff) > max_diff_chars:
+                # Bounds the prompt for very large changes; the head of a diff carries the most context.
+                parts += (file.diff[:max_diff_chars], _TRUNCATION_MARKER)
+            else:
+                parts.append(file.diff)
+            parts.append("\n```")
+        parts.append(_PROMPT_TAIL)
+        return "".join(parts)
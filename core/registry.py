@@ -1,4 +1,3 @@
-import inspect
 from typing import Any, Callable, Dict, Type, TypeVar
 
 T = TypeVar("T")
@@ -50,9 +49,10 @@ class Registry:
         Raises:
             KeyError: If the name is not registered.
         """
-        if name not in self._components:
-            raise KeyError(f"Component '{name}' not found in '{self._name}' registry.")
-        return self._components[name]
+        try:
+            return self._components[name]
+        except KeyError:
+            raise KeyError(f"Component '{name}' not found in '{self._name}' registry.") from None
 
     def create(self, name: str, *args: Any, **kwargs: Any) -> Any:
         """
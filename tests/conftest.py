@@ -0,0 +1,99 @@
+import asyncio
+from typing import Dict, Iterable, List, Tuple, Union
+
+import httpx
+import pytest
+
+from config.models import ModelConfig
+from core.llm.router import get_provider
+from utils import logger as logger_module
+from utils.logger import setup_logger
+
+
+
+@pytest.fixture(scope="session", autouse=True)
+def log_file(tmp_path_factory):
+    """Sends the file log of the test run to a temporary directory instead of the work tree."""
+    path = tmp_path_factory.mktemp("logs") / "aicommit.log"
+    setup_logger(log_file=str(path)).info("Test session started")
+    # Start the log worker and open the file now, rather than on a worker thread
+    # in the middle of whichever test logs first.
+    logger_module.file_sink.join()
+    return path
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    """A response body that arrives in the given chunks, as it would from the network."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class MockHTTP:
+    """
+    Routes HTTP requests to canned responses through an `httpx.MockTransport`,
+    so providers run their real httpx request and response code.
+
+    `client` is an `httpx.AsyncClient` on that transport, for injection into
+    providers, and `sync_client` its blocking counterpart; the shared client
+    of `utils.http` is routed here as well.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Union[httpx.Response, Exception]] = {}
+        self.requests: List[httpx.Request] = []
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        self.sync_client = httpx.Client(transport=httpx.MockTransport(self.handler))
+
+    def add(self, method: str, url: str, response: Union[httpx.Response, Exception]) -> None:
+        """Answers `method url` with `response`, or raises it if it is an exception."""
+        self.routes[(method, url)] = response
+
+    def reset(self) -> None:
+        self.routes.clear()
+        self.requests.clear()
+
+    @staticmethod
+    def stream(chunks: Iterable[bytes], status_code: int = 200) -> httpx.Response:
+        """A response whose body is delivered in `chunks`."""
+        return httpx.Response(status_code, stream=_ChunkedStream(chunks))
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.routes[(request.method, str(request.url))]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(scope="session")
+def session_http():
+    """One `MockHTTP`, and so one `AsyncClient`, for the whole test session."""
+    mock = MockHTTP()
+    yield mock
+    # The mock transport holds no connections, so closing on a fresh loop is fine.
+    asyncio.run(mock.client.aclose())
+    mock.sync_client.close()
+
+
+@pytest.fixture
+def mock_http(session_http, monkeypatch):
+    """The session's `MockHTTP` with no routes, also installed as the shared client's transport."""
+    session_http.reset()
+    monkeypatch.setattr(httpx, "AsyncHTTPTransport", lambda **kwargs: httpx.MockTransport(session_http.handler))
+    return session_http
+
+
+@pytest.fixture(scope="session")
+def providers():
+    """One provider per registered HTTP backend, created through the router once per session."""
+    return {
+        "openai": get_provider(ModelConfig(provider="openai", name="gpt-4o-mini", api_key="test_api_key")),
+        "claude": get_provider(ModelConfig(provider="claude", name="claude-3-opus-20240229", api_key="test_claude_api_key")),
+        "deepseek": get_provider(ModelConfig(provider="deepseek", name="deepseek-chat", api_key="test_deepseek_api_key")),
+        "local": get_provider(ModelConfig(provider="local", name="llama3", base_url="http://localhost:11434/v1", api_key="ollama")),
+    }
@@ -0,0 +1,77 @@
+import os
+import time
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import Cache
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    """Starts every test without entries remembered by earlier ones."""
+    cache_module._memo.clear()
+
+
+def test_cache_round_trip_stores_raw_value(tmp_path):
+    """Tests that a stored value is returned as-is and kept on disk as plain UTF-8."""
+    cache = Cache(cache_dir=str(tmp_path), ttl_sec=60)
+    cache.set("prompt", "feat: añadir caché\r\n\nbody")
+
+    assert cache.get("prompt") == "feat: añadir caché\r\n\nbody"
+    assert cache.get("other prompt") is None
+    (entry,) = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert entry.read_bytes() == "feat: añadir caché\r\n\nbody".encode("utf-8")
+    # Entries live in a shard directory named after the first byte of their key.
+    assert entry.parent.parent == tmp_path
+    assert len(entry.parent.name) == 2 and len(entry.name) == 62
+
+
+def test_cache_expired_entry_is_removed(tmp_path):
+    """Tests that an entry older than the TTL, by file mtime, is a miss and gets deleted."""
+    cache = Cache(cache_dir=str(tmp_path), ttl_sec=60)
+    cache.set("prompt", "value")
+    (entry,) = [p for p in tmp_path.rglob("*") if p.is_file()]
+    old = time.time() - 120
+    os.utime(entry, (old, old))
+    cache_module._memo.clear()  # As seen by a fresh process
+
+    assert cache.get("prompt") is None
+    assert not entry.exists()
+
+
+def test_cache_memo_serves_repeat_lookups_without_disk(tmp_path, mocker):
+    """Tests that entries are remembered in memory across Cache instances, within the TTL."""
+    Cache(cache_dir=str(tmp_path), ttl_sec=60).set("prompt", "value")
+    reader = Cache(cache_dir=str(tmp_path), ttl_sec=60)
+    stat = mocker.spy(cache_module.Path, "stat")
+
+    assert reader.get("prompt") == "value"
+    assert reader.get("prompt") == "value"
+    stat.assert_not_called()
+
+    # Past the TTL the memo is ignored and the (now expired) file is checked.
+    mocker.patch("utils.cache.time.time", return_value=time.time() + 120)
+    assert reader.get("prompt") is None
+    stat.assert_called_once()
+
+
+def test_cache_set_replaces_entry_atomically(tmp_path, mocker):
+    """Tests that entries are renamed into place and a failed write leaves no temporary file."""
+    cache = Cache(cache_dir=str(tmp_path), ttl_sec=60)
+    cache.set("prompt", "first")
+    cache.set("prompt", "second")
+    assert [p.read_text() for p in tmp_path.rglob("*") if p.is_file()] == ["second"]
+
+    mocker.patch("utils.cache.os.replace", side_effect=OSError("disk full"))
+    cache.set("other prompt", "value")
+    assert [p.read_text() for p in tmp_path.rglob("*") if p.is_file()] == ["second"]
+
+
+def test_cache_disabled_with_zero_ttl(tmp_path):
+    """Tests that a non-positive TTL disables reads and writes."""
+    cache = Cache(cache_dir=str(tmp_path / "cache"), ttl_sec=0)
+    cache.set("prompt", "value")
+
+    assert cache.get("prompt") is None
+    assert not (tmp_path / "cache").exists()
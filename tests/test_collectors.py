@@ -1,162 +1,244 @@
+import io
 import subprocess
-import unittest
-from unittest.mock import MagicMock, mock_open, patch
+
+import pytest
 
 from core.collectors.diff_collector import DiffCollector
 from core.collectors.history_collector import HistoryCollector
 from core.collectors.readme_collector import ReadmeCollector
 from utils.errors import CollectorError
+from utils.git import split_diff_by_file
+
+
+@pytest.fixture
+def diff_collector():
+    return DiffCollector()
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    """Runs the test in an empty temporary project directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _write(directory, filename, content):
+    (directory / filename).write_bytes(content.encode("utf-8"))
+
+
+# DiffCollector
+
+def _git_diff(mocker, returncode=0, stdout=b"", stderr=b""):
+    """Stands in for the `git diff` process whose output the collector streams."""
+    proc = mocker.MagicMock()
+    proc.__enter__.return_value = proc
+    proc.stdout = io.BytesIO(stdout)
+    proc.wait.return_value = returncode
+
+    def popen(args, **kwargs):
+        kwargs["stderr"].write(stderr)
+        return proc
+
+    return mocker.patch("subprocess.Popen", side_effect=popen)
+
+
+def test_diff_collect_with_staged_changes(diff_collector, mocker):
+    # Arrange
+    first = b"diff --git a/file.py b/file.py\n--- a/file.py\n+++ b/file.py\n@@ -1,1 +1,1 @@\n-hello\n+world\n"
+    second = b"diff --git a/dir/b c.txt b/dir/b c.txt\n--- a/dir/b c.txt\n+++ b/dir/b c.txt\n@@ -0,0 +1 @@\n+new\n"
+    mock_popen = _git_diff(mocker, returncode=0, stdout=first + second)
+
+    # Act
+    result = diff_collector.collect()
+
+    # Assert: one FileChange per file, split as the pipeline would split the raw diff
+    assert [(f.path, f.diff) for f in result["files"]] == split_diff_by_file((first + second).decode("utf-8"))
+    assert [f.path for f in result["files"]] == ["file.py", "dir/b c.txt"]
+    mock_popen.assert_called_once()
+    args, kwargs = mock_popen.call_args
+    assert args[0] == ["git", "diff", "--cached", "--no-color"]
+    assert kwargs["stdout"] == subprocess.PIPE
+    assert "text" not in kwargs
+    assert kwargs["env"]["GIT_OPTIONAL_LOCKS"] == "0"
+
+
+def test_diff_collect_invalid_utf8_is_replaced(diff_collector, mocker):
+    # Arrange
+    _git_diff(mocker, stdout=b"diff --git a/f b/f\n+caf\xe9\n")
+
+    # Act
+    result = diff_collector.collect()
+
+    # Assert
+    assert result["files"][0].diff == "diff --git a/f b/f\n+caf\ufffd"
+
+
+def test_diff_collect_no_staged_changes(diff_collector, mocker):
+    # Arrange
+    _git_diff(mocker, stdout=b"")
+
+    # Act
+    result = diff_collector.collect()
+
+    # Assert
+    assert result == {"files": []}
+
+
+def test_diff_collect_skips_diff_of_oversized_files(mocker):
+    # Arrange: numstat -z lists a small file and a large renamed one
+    mock_run = mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=b"1\t0\tsmall.py\x00900\t100\t\x00old.txt\x00big.txt\x00", stderr=b""
+    ))
+    mock_popen = _git_diff(mocker, stdout=b"diff --git a/small.py b/small.py\n+x\n")
+    collector = DiffCollector(max_file_lines=500)
+
+    # Act
+    result = collector.collect()
+
+    # Assert: git is asked to leave out both sides of the large rename
+    assert mock_run.call_args[0][0] == ["git", "diff", "--cached", "--numstat", "-z"]
+    assert mock_popen.call_args[0][0][-3:] == [":/", ":(top,exclude,literal)big.txt", ":(top,exclude,literal)old.txt"]
+    assert [(f.path, f.diff) for f in result["files"]] == [
+        ("small.py", "diff --git a/small.py b/small.py\n+x"),
+        ("big.txt", "diff --git a/old.txt b/big.txt\n... (900 additions, 100 deletions; diff omitted)"),
+    ]
+
+
+def test_diff_collect_git_not_found(diff_collector, mocker):
+    # Arrange
+    mocker.patch("subprocess.Popen", side_effect=FileNotFoundError)
+
+    # Act & Assert
+    with pytest.raises(CollectorError, match="Git is not installed"):
+        diff_collector.collect()
+
+
+def test_diff_collect_git_error(diff_collector, mocker):
+    # Arrange
+    _git_diff(mocker, returncode=128, stderr=b"fatal: not a git repository")
+
+    # Act & Assert
+    with pytest.raises(CollectorError, match="Failed to get git diff"):
+        diff_collector.collect()
+
+
+# ReadmeCollector
+
+def test_readme_collect_with_readme_md(project_dir):
+    # Arrange
+    _write(project_dir, "README.md", "This is a test README.")
+    _write(project_dir, "README.rst", "Not this one.")
+    collector = ReadmeCollector()
+
+    # Act
+    result = collector.collect()
+
+    # Assert
+    assert result == {"readme": "This is a test README."}
 
 
-class TestDiffCollector(unittest.TestCase):
+def test_readme_collect_with_readme_rst(project_dir):
+    # Arrange
+    _write(project_dir, "README.rst", "This is a test README in RST.\r\nSecond line.")
+    collector = ReadmeCollector()
 
-    @patch("subprocess.run")
-    def test_collect_with_staged_changes(self, mock_run):
-        # Arrange
-        mock_process = MagicMock()
-        mock_process.returncode = 1
-        mock_process.stdout = "diff --git a/file.py b/file.py\n--- a/file.py\n+++ b/file.py\n@@ -1,1 +1,1 @@\n-hello\n+world"
-        mock_process.stderr = ""
-        mock_run.return_value = mock_process
+    # Act
+    result = collector.collect()
 
-        collector = DiffCollector()
+    # Assert
+    assert result == {"readme": "This is a test README in RST.\nSecond line."}
 
-        # Act
-        result = collector.collect()
 
-        # Assert
-        self.assertEqual(result, {"diff": mock_process.stdout})
-        mock_run.assert_called_once_with(
-            ["git", "diff", "--cached"], capture_output=True, text=True, encoding="utf-8"
-        )
+def test_readme_collect_matches_readme_case_insensitively(project_dir):
+    # Arrange
+    _write(project_dir, "Readme.rst", "Mixed-case RST.")
+    _write(project_dir, "readme.md", "Lower-case Markdown.")
+    collector = ReadmeCollector()
 
-    @patch("subprocess.run")
-    def test_collect_no_staged_changes(self, mock_run):
-        # Arrange
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_process.stdout = ""
-        mock_process.stderr = ""
-        mock_run.return_value = mock_process
+    # Act
+    result = collector.collect()
 
-        collector = DiffCollector()
+    # Assert: Markdown is still preferred over RST
+    assert result == {"readme": "Lower-case Markdown."}
 
-        # Act
-        result = collector.collect()
 
-        # Assert
-        self.assertEqual(result, {"diff": ""})
+def test_readme_collect_with_empty_readme(project_dir):
+    # Arrange
+    _write(project_dir, "README.md", "")
+    collector = ReadmeCollector()
 
-    @patch("subprocess.run", side_effect=FileNotFoundError)
-    def test_collect_git_not_found(self, mock_run):
-        # Arrange
-        collector = DiffCollector()
+    # Act
+    result = collector.collect()
 
-        # Act & Assert
-        with self.assertRaises(CollectorError) as cm:
-            collector.collect()
-        self.assertIn("Git is not installed", str(cm.exception))
+    # Assert
+    assert result == {"readme": ""}
 
-    @patch("subprocess.run")
-    def test_collect_git_error(self, mock_run):
-        # Arrange
-        mock_process = MagicMock()
-        mock_process.returncode = 128
-        mock_process.stderr = "fatal: not a git repository"
-        mock_run.return_value = mock_process
 
-        collector = DiffCollector()
+def test_readme_collect_reuses_cached_readme_until_changed(project_dir, mocker):
+    # Arrange
+    _write(project_dir, "README.md", "First version.")
+    collector = ReadmeCollector()
+    collector.collect()
 
-        # Act & Assert
-        with self.assertRaises(CollectorError) as cm:
-            collector.collect()
-        self.assertIn("Failed to get git diff", str(cm.exception))
+    # Act & Assert: an unchanged file is served from the cache
+    mock_read = mocker.patch("core.collectors.readme_collector._read_text")
+    assert collector.collect() == {"readme": "First version."}
+    mock_read.assert_not_called()
+    mocker.stop(mock_read)
 
+    # Act & Assert: a different size invalidates the entry
+    _write(project_dir, "README.md", "Second, longer version.")
+    assert collector.collect() == {"readme": "Second, longer version."}
 
-class TestReadmeCollector(unittest.TestCase):
 
-    @patch("os.path.exists", side_effect=lambda f: f == "README.md")
-    @patch("builtins.open", new_callable=mock_open, read_data="This is a test README.")
-    def test_collect_with_readme_md(self, mock_file, mock_exists):
-        # Arrange
-        collector = ReadmeCollector()
+def test_readme_collect_no_readme_found(project_dir):
+    # Arrange
+    collector = ReadmeCollector()
 
-        # Act
-        result = collector.collect()
+    # Act
+    result = collector.collect()
 
-        # Assert
-        self.assertEqual(result, {"readme": "This is a test README."})
-        mock_file.assert_called_once_with("README.md", "r", encoding="utf-8")
+    # Assert
+    assert result == {"readme": ""}
 
-    @patch("os.path.exists", side_effect=lambda f: f == "README.rst")
-    @patch("builtins.open", new_callable=mock_open, read_data="This is a test README in RST.")
-    def test_collect_with_readme_rst(self, mock_file, mock_exists):
-        # Arrange
-        collector = ReadmeCollector()
 
-        # Act
-        result = collector.collect()
+# HistoryCollector
 
-        # Assert
-        self.assertEqual(result, {"readme": "This is a test README in RST."})
-        mock_file.assert_called_once_with("README.rst", "r", encoding="utf-8")
+def test_history_collect_with_history(mocker):
+    # Arrange
+    mock_run = mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess(
+        args=[], returncode=0, stdout="feat: new feature\x00fix: a bug\x00", stderr=""
+    ))
+    collector = HistoryCollector(limit=2)
 
-    @patch("os.path.exists", return_value=False)
-    def test_collect_no_readme_found(self, mock_exists):
-        # Arrange
-        collector = ReadmeCollector()
+    # Act
+    result = collector.collect()
 
-        # Act
-        result = collector.collect()
-
-        # Assert
-        self.assertEqual(result, {"readme": ""})
-
-
-class TestHistoryCollector(unittest.TestCase):
-
-    @patch("subprocess.run")
-    def test_collect_with_history(self, mock_run):
-        # Arrange
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_process.stdout = "feat: new feature\x00fix: a bug\x00"
-        mock_process.stderr = ""
-        mock_run.return_value = mock_process
-
-        collector = HistoryCollector(limit=2)
-
-        # Act
-        result = collector.collect()
-
-        # Assert
-        self.assertEqual(result, {"history": ["feat: new feature", "fix: a bug"]})
-        mock_run.assert_called_once_with(
-            ["git", "log", "-n2", "--pretty=%B%x00"],
-            capture_output=True, text=True, check=True, encoding="utf-8"
-        )
+    # Assert
+    assert result == {"history": ["feat: new feature", "fix: a bug"]}
+    mock_run.assert_called_once_with(
+        ["git", "log", "-n2", "--pretty=%B%x00"],
+        capture_output=True, text=True, check=True, encoding="utf-8", env=mocker.ANY
+    )
 
-    @patch("subprocess.run")
-    def test_collect_empty_history(self, mock_run):
-        # Arrange
-        mock_run.side_effect = subprocess.CalledProcessError(
-            returncode=128, cmd="git log", stderr="does not have any commits"
-        )
-        collector = HistoryCollector(limit=5)
 
-        # Act
-        result = collector.collect()
+def test_history_collect_empty_history(mocker):
+    # Arrange
+    mocker.patch("subprocess.run", side_effect=subprocess.CalledProcessError(
+        returncode=128, cmd="git log", stderr="does not have any commits"
+    ))
+    collector = HistoryCollector(limit=5)
 
-        # Assert
-        self.assertEqual(result, {"history": []})
+    # Act
+    result = collector.collect()
 
-    def test_init_invalid_limit(self):
-        # Act & Assert
-        with self.assertRaises(ValueError):
-            HistoryCollector(limit=0)
-        with self.assertRaises(ValueError):
-            HistoryCollector(limit=-1)
+    # Assert
+    assert result == {"history": []}
 
 
-if __name__ == "__main__":
-    unittest.main()
+def test_history_init_invalid_limit():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        HistoryCollector(limit=0)
+    with pytest.raises(ValueError):
+        HistoryCollector(limit=-1)
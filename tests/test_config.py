@@ -0,0 +1,200 @@
+import io
+
+import pytest
+
+from config import logic
+from config._default_config import DEFAULTS, DEFAULTS_DIGEST
+from config.build_defaults import DEFAULT_YAML_PATH, default_yaml_digest, load_default_yaml
+from config.env import EnvValue
+from config.hook_scan import scan_hook_config
+from config.loader import load_config
+from config.logic import deep_merge, load_and_merge_configs
+from utils.errors import AICommitException, ConfigError
+
+
+@pytest.fixture
+def config_env(tmp_path, monkeypatch):
+    """Points the config loader at temporary defaults, user config file and cache dir."""
+    user_path = tmp_path / "config.yaml"
+    user_path.write_text(
+        "model:\n"
+        "  provider: openai\n"
+        "  api_key: !env ${AICOMMIT_TEST_KEY}\n"
+        "cache:\n"
+        "  enabled: true\n"
+    )
+    monkeypatch.setattr(logic, "DEFAULTS", {"model": {"name": "default-model"}})
+    monkeypatch.setattr(logic, "USER_CONFIG_PATH", user_path)
+    monkeypatch.setattr(logic, "find_project_config", lambda: None)
+    monkeypatch.setattr(logic, "CONFIG_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setenv("AICOMMIT_TEST_KEY", "secret-key")
+    return user_path
+
+
+def test_load_and_merge_configs_writes_cache(config_env, tmp_path):
+    """Tests that the merged config is cached without the substituted secret."""
+    config = load_and_merge_configs()
+
+    assert config.model.api_key == "secret-key"
+    assert config.model.name == "default-model"
+    cache_files = list((tmp_path / "cache").glob("config-*.pkl"))
+    assert len(cache_files) == 1
+    assert b"secret-key" not in cache_files[0].read_bytes()
+
+
+def test_load_and_merge_configs_cache_hit_skips_yaml(config_env, mocker, monkeypatch):
+    """Tests that a warm cache bypasses YAML parsing and re-reads the environment."""
+    load_and_merge_configs()
+    mock_load = mocker.patch("config.loader.load_config")
+    monkeypatch.setenv("AICOMMIT_TEST_KEY", "rotated-key")
+
+    config = load_and_merge_configs()
+
+    mock_load.assert_not_called()
+    assert config.model.api_key == "rotated-key"
+
+
+def test_load_and_merge_configs_warm_run_matches_cold_run(config_env, monkeypatch):
+    """Tests that only substituted keys are re-read on a cache hit, not look-alike literals."""
+    monkeypatch.setenv("USER_LITERAL", "surprise")
+    config_env.write_text(
+        "model:\n"
+        "  provider: openai\n"
+        "  name: \"${USER_LITERAL}\"\n"
+        "  api_key: !env ${AICOMMIT_TEST_KEY}\n"
+        "  base_url: secret-key\n"
+    )
+
+    cold = load_and_merge_configs()
+    warm = load_and_merge_configs()
+
+    assert cold.model.name == "${USER_LITERAL}"
+    assert cold.model.base_url == "secret-key"  # A literal that equals the secret
+    assert warm == cold
+    monkeypatch.setenv("AICOMMIT_TEST_KEY", "rotated-key")
+    assert load_and_merge_configs().model.base_url == "secret-key"
+
+
+def test_load_and_merge_configs_cache_invalidated_on_edit(config_env):
+    """Tests that editing a source file invalidates the cached config."""
+    load_and_merge_configs()
+    config_env.write_text("model:\n  provider: claude\n  name: changed-model\n")
+
+    config = load_and_merge_configs()
+
+    assert config.model.name == "changed-model"
+
+
+def test_load_and_merge_configs_memo_keeps_latest_version(config_env):
+    """Tests that each edit of a config replaces its in-process entry rather than adding one."""
+    for name in ("first", "second-model", "third-model-name"):
+        config_env.write_text(f"model:\n  provider: openai\n  name: {name}\n")
+        assert load_and_merge_configs().model.name == name
+
+    entries = [key for key in logic._MERGED_CONFIG_MEMO if str(config_env) in key[1]]
+    assert len(entries) == 1
+
+
+def test_load_and_merge_configs_non_mapping_cache_section(config_env, tmp_path):
+    """Tests that a non-mapping `cache` value fails validation and is never cached."""
+    config_env.write_text("model:\n  provider: openai\ncache: true\n")
+
+    with pytest.raises(AICommitException, match="Configuration validation failed"):
+        load_and_merge_configs()
+    assert not list((tmp_path / "cache").glob("config-*.pkl"))
+
+
+def test_load_and_merge_configs_defaults_only_skips_yaml(config_env, mocker, monkeypatch, tmp_path):
+    """Tests that without user or project config the pre-built defaults are used as is."""
+    monkeypatch.setattr(logic, "USER_CONFIG_PATH", tmp_path / "missing.yaml")
+    mock_load = mocker.patch("config.loader.load_config")
+
+    config = load_and_merge_configs()
+
+    mock_load.assert_not_called()
+    assert config.model.name == "default-model"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_default_config_module_is_up_to_date():
+    """Tests that `_default_config.py` was regenerated after the last edit of default.yaml."""
+    source = DEFAULT_YAML_PATH.read_bytes()
+
+    assert DEFAULTS_DIGEST == default_yaml_digest(source)
+    assert DEFAULTS == load_default_yaml(source)
+
+
+def test_load_config_env_substitution(monkeypatch):
+    """Tests that only whole-scalar `${VAR}` references are substituted."""
+    monkeypatch.setenv("AICOMMIT_TEST_KEY", "secret-key")
+
+    config = load_config(
+        io.StringIO(
+            "explicit: !env ${AICOMMIT_TEST_KEY}\n"
+            "implicit: ${AICOMMIT_TEST_KEY}\n"
+            "quoted: \"${AICOMMIT_TEST_KEY}\"\n"
+            "plain: !env no-reference\n"
+            "partial: !env ${AICOMMIT_TEST_KEY}-suffix\n"
+        ),
+    )
+
+    assert config == {
+        "explicit": "secret-key",
+        "implicit": "secret-key",
+        "quoted": "${AICOMMIT_TEST_KEY}",
+        "plain": "no-reference",
+        "partial": "${AICOMMIT_TEST_KEY}-suffix",
+    }
+    # Substituted values remember their variable; everything else is a plain string.
+    assert {k: v.name for k, v in config.items() if isinstance(v, EnvValue)} == {
+        "explicit": "AICOMMIT_TEST_KEY",
+        "implicit": "AICOMMIT_TEST_KEY",
+    }
+
+
+def test_load_config_missing_env_var(monkeypatch):
+    """Tests that referencing an unset environment variable raises a ConfigError."""
+    monkeypatch.delenv("AICOMMIT_MISSING_KEY", raising=False)
+    with pytest.raises(ConfigError, match="AICOMMIT_MISSING_KEY"):
+        load_config(io.StringIO("key: !env ${AICOMMIT_MISSING_KEY}\n"))
+
+
+def test_deep_merge_nested():
+    """Tests that nested mappings merge while lists and scalars are replaced."""
+    target = {"model": {"name": "a", "parameters": {"temperature": 0.1}}, "collectors": [1, 2]}
+    source = {"model": {"parameters": {"top_p": 0.9}}, "collectors": [3], "new": {"x": 1}}
+
+    merged = deep_merge(target, source)
+
+    assert merged is target
+    assert merged == {
+        "model": {"name": "a", "parameters": {"temperature": 0.1, "top_p": 0.9}},
+        "collectors": [3],
+        "new": {"x": 1},
+    }
+
+
+def test_scan_hook_config_reads_block_section(tmp_path):
+    """Tests that the hook fast path reads plain `hook:` blocks without PyYAML."""
+    config_path = tmp_path / "custom.yaml"
+    config_path.write_text(
+        "model:\n"
+        "  enabled: true\n"
+        "hook:\n"
+        "  # disabled for this repo\n"
+        "  enabled: no\n"
+        "output:\n"
+        "  language: en\n"
+    )
+
+    assert scan_hook_config(str(config_path)) == {"enabled": False, "no_overwrite": False}
+
+
+def test_scan_hook_config_defers_unsupported_yaml(tmp_path):
+    """Tests that flow mappings and non-boolean values fall back to the full loader."""
+    config_path = tmp_path / "custom.yaml"
+    config_path.write_text("hook: {enabled: false}\n")
+    assert scan_hook_config(str(config_path)) is None
+
+    config_path.write_text("hook:\n  enabled: !env ${AICOMMIT_HOOK}\n")
+    assert scan_hook_config(str(config_path)) is None
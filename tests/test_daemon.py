@@ -0,0 +1,99 @@
+import asyncio
+import os
+import shutil
+import stat
+import subprocess
+
+import pytest
+
+from commands.daemon import REPLY_OK, REPLY_SKIPPED, handle_hook_request, serve
+from config.models import Config
+from utils.git import git_env, iter_staged_diff_files
+
+
+def _git(repo, *args, env=None):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, env={**os.environ, **(env or {})},
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A repository with one commit; the test returns to its own directory afterwards."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    (repo / "a.txt").write_text("a\n")
+    _git(repo, "add", "a.txt")
+    _git(repo, "commit", "-q", "-m", "init")
+    monkeypatch.chdir(repo)  # handle_hook_request changes directory
+    return repo
+
+
+@pytest.fixture
+def generation(mocker):
+    """Default config, and a "generated" message listing the staged paths git reports."""
+    mocker.patch("config.logic.load_and_merge_configs", return_value=Config())
+
+    async def staged_paths(config):
+        return " ".join(path for path, _ in iter_staged_diff_files())
+
+    return mocker.patch("commands.generate.run_generation", side_effect=staged_paths)
+
+
+@pytest.mark.asyncio
+async def test_hook_request_uses_the_hooks_index(repo, generation):
+    """Tests that a `git commit -a` style temporary index sent by the hook is what gets read."""
+    (repo / "a.txt").write_text("changed\n")
+    index = repo / ".git" / "next-index"
+    shutil.copy(repo / ".git" / "index", index)
+    _git(repo, "add", "a.txt", env={"GIT_INDEX_FILE": str(index)})
+    msg_file = repo / ".git" / "COMMIT_EDITMSG"
+
+    reply = await handle_hook_request(str(repo), str(msg_file), "", git_env={"GIT_INDEX_FILE": str(index)})
+
+    assert reply == REPLY_OK
+    assert msg_file.read_text() == "a.txt"
+    assert "GIT_INDEX_FILE" not in git_env()
+    # The repository's own index has nothing staged.
+    assert await handle_hook_request(str(repo), str(msg_file), "") == REPLY_SKIPPED
+    generation.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_serve_answers_hooks_over_a_private_socket(tmp_path, mocker):
+    """Tests the socket protocol, for current and older hooks, and the socket's lifetime."""
+    requests = []
+
+    async def handle(*fields, git_env):
+        requests.append((fields, git_env))
+        return REPLY_OK
+
+    mocker.patch("commands.daemon.handle_hook_request", side_effect=handle)
+    socket_path = tmp_path / "daemon.sock"
+    server = asyncio.create_task(serve(socket_path))
+    for _ in range(500):
+        if socket_path.exists():
+            break
+        await asyncio.sleep(0.01)
+    assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+    for request in (
+        b"/repo\n.git/COMMIT_EDITMSG\n\n.git/next-index\n\n\n",
+        b"/repo\n.git/COMMIT_EDITMSG\nmessage\n",  # A hook that predates the git variables
+    ):
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        writer.write(request)
+        writer.write_eof()
+        assert await reader.readline() == b"ok\n"
+        writer.close()
+        await writer.wait_closed()
+
+    server.cancel()
+    await asyncio.gather(server, return_exceptions=True)
+    assert not socket_path.exists()
+    assert requests == [
+        (("/repo", ".git/COMMIT_EDITMSG", ""), {"GIT_INDEX_FILE": ".git/next-index", "GIT_DIR": "", "GIT_WORK_TREE": ""}),
+        (("/repo", ".git/COMMIT_EDITMSG", "message"), {"GIT_INDEX_FILE": "", "GIT_DIR": "", "GIT_WORK_TREE": ""}),
+    ]
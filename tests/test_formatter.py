@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -8,15 +10,16 @@ from utils.errors import FormatterError
 
 
 class TestJinja2Formatter(unittest.TestCase):
-    def setUp(self):
-        # Create a dummy context for testing
-        self.ctx = Context(
+    @classmethod
+    def setUpClass(cls):
+        # Create a dummy context for testing; the tests only read it.
+        cls.ctx = Context(
             files=[],
             readme="This is a test readme.",
             recent_commits=["feat: initial commit"],
             meta={"branch": "main"},
         )
-        self.model_output = "feat: add new feature\n\nThis is a great new feature."
+        cls.model_output = "feat: add new feature\n\nThis is a great new feature."
 
     def test_format_conventional(self):
         # Test with the conventional template
@@ -30,6 +33,14 @@ class TestJinja2Formatter(unittest.TestCase):
         formatted_message = formatter.format(self.ctx, self.model_output)
         self.assertEqual(formatted_message, self.model_output)
 
+    def test_formatters_share_environment(self):
+        # Formatters for the same directory reuse one environment and its compiled templates
+        first = Jinja2Formatter(template_name="simple.j2")
+        first.format(self.ctx, self.model_output)
+        second = Jinja2Formatter(template_name="conventional.j2")
+        self.assertIs(first.env, second.env)
+        self.assertIs(second.env.get_template("simple.j2"), first._template)
+
     def test_template_not_found(self):
         # Test for template not found error
         formatter = Jinja2Formatter(template_name="non_existent_template.j2")
@@ -37,22 +48,31 @@ class TestJinja2Formatter(unittest.TestCase):
             formatter.format(self.ctx, self.model_output)
 
     def test_custom_template_dir(self):
-        # Test with a custom template directory
-        custom_template_dir = Path("./tests/custom_templates")
-        custom_template_dir.mkdir(exist_ok=True)
-        custom_template_path = custom_template_dir / "custom.j2"
-        with open(custom_template_path, "w") as f:
-            f.write("Custom: {{ model_output }}")
-
-        formatter = Jinja2Formatter(
-            template_dir=str(custom_template_dir), template_name="custom.j2"
-        )
-        formatted_message = formatter.format(self.ctx, self.model_output)
-        self.assertEqual(formatted_message, f"Custom: {self.model_output}")
+        # Test with a custom template directory, removed again by the context manager
+        with tempfile.TemporaryDirectory() as custom_template_dir:
+            (Path(custom_template_dir) / "custom.j2").write_text("Custom: {{ model_output }}")
+
+            formatter = Jinja2Formatter(
+                template_dir=custom_template_dir, template_name="custom.j2"
+            )
+            formatted_message = formatter.format(self.ctx, self.model_output)
+            self.assertEqual(formatted_message, f"Custom: {self.model_output}")
+
+    def test_edited_template_is_reloaded(self):
+        # A long-lived process (aicommit daemon) must pick up edits to a custom template
+        with tempfile.TemporaryDirectory() as custom_template_dir:
+            template_path = Path(custom_template_dir) / "t.j2"
+            template_path.write_text("Old: {{ model_output }}")
+            first = Jinja2Formatter(template_dir=custom_template_dir, template_name="t.j2")
+            self.assertEqual(first.format(self.ctx, "x"), "Old: x")
+
+            template_path.write_text("New: {{ model_output }}")
+            # Move the mtime forward explicitly, as both writes may share a timestamp
+            mtime = template_path.stat().st_mtime + 10
+            os.utime(template_path, (mtime, mtime))
 
-        # Clean up the custom template
-        custom_template_path.unlink()
-        custom_template_dir.rmdir()
+            second = Jinja2Formatter(template_dir=custom_template_dir, template_name="t.j2")
+            self.assertEqual(second.format(self.ctx, "x"), "New: x")
 
 
 if __name__ == "__main__":
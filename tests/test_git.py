@@ -0,0 +1,71 @@
+import subprocess
+
+import pytest
+
+from utils.errors import AICommitException
+from utils.git import get_current_branch_name, get_work_tree_branch, split_diff_by_file, staged_file_stats
+
+
+def _rev_parse(mocker, returncode, stdout, stderr=""):
+    return mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess(
+        args=[], returncode=returncode, stdout=stdout, stderr=stderr
+    ))
+
+
+def test_work_tree_branch_uses_one_git_process(mocker):
+    """Tests that the work tree check and the branch name come from one rev-parse call."""
+    mock_run = _rev_parse(mocker, 0, "true\nfeature/123-x\n")
+
+    assert get_current_branch_name() == "feature/123-x"
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0] == ["git", "rev-parse", "--is-inside-work-tree", "--abbrev-ref", "HEAD"]
+
+
+def test_work_tree_branch_outside_work_tree(mocker):
+    """Tests that no repository, a .git directory and a missing git all mean no branch."""
+    _rev_parse(mocker, 128, "", "fatal: not a git repository")
+    assert get_work_tree_branch() is None
+
+    _rev_parse(mocker, 0, "false\nmaster\n")
+    assert get_work_tree_branch() is None
+
+    mocker.patch("subprocess.run", side_effect=FileNotFoundError)
+    assert get_work_tree_branch() is None
+    with pytest.raises(AICommitException, match="Not a Git repository"):
+        get_current_branch_name()
+
+
+def test_work_tree_branch_without_commits(mocker):
+    """Tests that a repository whose HEAD cannot be resolved is an error, not 'no repository'."""
+    _rev_parse(mocker, 128, "true\nHEAD\n", "fatal: ambiguous argument 'HEAD'")
+
+    with pytest.raises(AICommitException, match="Failed to get current branch name"):
+        get_work_tree_branch()
+
+
+def test_staged_file_stats_parses_numstat(mocker):
+    """Tests plain, binary and renamed entries of `git diff --cached --numstat -z`."""
+    mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=b"3\t1\ta b.py\x00-\t-\timg.png\x000\t0\t\x00old.txt\x00new.txt\x00", stderr=b""
+    ))
+
+    assert staged_file_stats() == [
+        ("a b.py", 3, 1, None),
+        ("img.png", None, None, None),
+        ("new.txt", 0, 0, "old.txt"),
+    ]
+
+
+def test_split_diff_by_file_ignores_headers_inside_hunks():
+    """Tests that a quoted `diff --git` line in a hunk does not start a new section."""
+    diff = (
+        "diff --git a/x.py b/x.py\n"
+        "+s = 'diff --git a/foo b/foo'\n"
+        "diff --git a/y.py b/y.py\n"
+        "+y = 1\n"
+    )
+
+    assert split_diff_by_file(diff) == [
+        ("x.py", "diff --git a/x.py b/x.py\n+s = 'diff --git a/foo b/foo'"),
+        ("y.py", "diff --git a/y.py b/y.py\n+y = 1"),
+    ]
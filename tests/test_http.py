@@ -0,0 +1,25 @@
+import asyncio
+
+from utils.http import aclose_async_client, get_async_client
+
+
+def test_get_async_client_shared_within_loop():
+    """Tests that one client is reused within an event loop and closed on request."""
+    async def run():
+        client = get_async_client()
+        assert get_async_client() is client
+        await aclose_async_client()
+        assert client.is_closed
+        return client
+
+    asyncio.run(run())
+
+
+def test_get_async_client_per_event_loop():
+    """Tests that separate event loops never share a client."""
+    async def get():
+        client = get_async_client()
+        await aclose_async_client()
+        return client
+
+    assert asyncio.run(get()) is not asyncio.run(get())
@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+
+from utils import logger as logger_module
+from utils.logger import BufferedFileSink, QueuedSink, setup_logger
+
+
+def test_buffered_sink_writes_in_batches(tmp_path):
+    """Tests that records stay buffered until flush_bytes are pending or the sink stops."""
+    log_file = tmp_path / "logs" / "aicommit.log"
+    sink = BufferedFileSink(log_file, flush_bytes=16, flush_interval=60)
+
+    sink.write("first\n")
+    assert log_file.read_bytes() == b""
+    sink.write("second line\n")
+    assert log_file.read_bytes() == b"first\nsecond line\n"
+
+    sink.write("third\n")
+    sink.stop()
+    assert log_file.read_bytes() == b"first\nsecond line\nthird\n"
+
+
+def test_sinks_do_nothing_until_the_first_record(tmp_path, mocker):
+    """Tests that setting up the file sink neither creates the file nor starts a thread."""
+    log_file = tmp_path / "logs" / "aicommit.log"
+    thread = mocker.patch("utils.logger.threading.Thread")
+
+    sink = QueuedSink(BufferedFileSink(log_file))
+    assert not log_file.parent.exists()
+    thread.assert_not_called()
+
+    sink.stop()
+    assert not log_file.parent.exists()
+
+
+def test_buffered_sink_flushes_when_idle(tmp_path):
+    """Tests that a pending record is written flush_interval seconds after it arrived."""
+    log_file = tmp_path / "aicommit.log"
+    sink = BufferedFileSink(log_file, flush_interval=0.01)
+
+    sink.write("record\n")
+    deadline = time.monotonic() + 5
+    while log_file.read_bytes() != b"record\n" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert log_file.read_bytes() == b"record\n"
+    sink.stop()
+
+
+def test_buffered_sink_rotates_and_prunes(tmp_path):
+    """Tests that a full file is renamed aside and expired rotated files are deleted."""
+    log_file = tmp_path / "aicommit.log"
+    expired = tmp_path / "aicommit.2020-01-01_00-00-00_000000.log"
+    expired.write_text("old")
+    os.utime(expired, (0, 0))
+    sink = BufferedFileSink(log_file, rotation_bytes=10)
+
+    sink.write("12345678\n")
+    sink.write("abc\n")
+    sink.stop()
+
+    (rotated,) = tmp_path.glob("aicommit.*.log")
+    assert rotated.read_bytes() == b"12345678\n"
+    assert log_file.read_bytes() == b"abc\n"
+
+
+class _RecordingSink:
+    def __init__(self, hold=None):
+        self.messages = []
+        self.stopped = False
+        self.started = threading.Event()
+        self._hold = hold
+
+    def write(self, message):
+        self.started.set()
+        if self._hold is not None:
+            self._hold.wait(5)
+        self.messages.append(message)
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_queued_sink_drains_in_order_on_stop():
+    """Tests that records reach the wrapped sink in order before it is stopped."""
+    inner = _RecordingSink()
+    sink = QueuedSink(inner)
+
+    for i in range(100):
+        sink.write(f"record {i}\n")
+    sink.stop()
+
+    assert inner.messages == [f"record {i}\n" for i in range(100)]
+    assert inner.stopped
+
+
+def test_queued_sink_drops_oldest_when_full():
+    """Tests that writers never block on a slow sink; the oldest queued record is dropped."""
+    release = threading.Event()
+    inner = _RecordingSink(hold=release)
+    sink = QueuedSink(inner, maxsize=2)
+
+    sink.write("a")
+    assert inner.started.wait(5)  # The worker holds "a" until released
+    for message in ("b", "c", "d"):
+        sink.write(message)
+    release.set()
+    sink.stop()
+
+    assert inner.messages == ["a", "c", "d"]
+
+
+def test_queued_sink_join_waits_for_the_worker():
+    """Tests that join() returns once queued records reached the wrapped sink, which stays open."""
+    inner = _RecordingSink()
+    sink = QueuedSink(inner)
+
+    sink.join()  # Nothing queued and no worker yet
+    for i in range(10):
+        sink.write(f"record {i}\n")
+    sink.join()
+
+    assert inner.messages == [f"record {i}\n" for i in range(10)]
+    assert not inner.stopped
+    sink.stop()
+
+
+def test_file_sink_skips_debug_without_diag(tmp_path, monkeypatch, log_file):
+    """Tests that DEBUG dumps are not even built unless AICOMMIT_DIAG=1 or --verbose asks for them."""
+    dump = []
+    try:
+        monkeypatch.delenv("AICOMMIT_DIAG", raising=False)
+        setup_logger(log_file=str(tmp_path / "aicommit.log")).opt(lazy=True).debug("{}", lambda: dump.append(1))
+        assert dump == []
+
+        monkeypatch.setenv("AICOMMIT_DIAG", "1")
+        setup_logger(log_file=str(tmp_path / "aicommit.log")).opt(lazy=True).debug("{}", lambda: dump.append(1))
+        assert dump == [1]
+    finally:
+        setup_logger(log_file=str(log_file)).info("Restored the session log")
+        logger_module.file_sink.join()
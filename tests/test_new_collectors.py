@@ -1,111 +1,134 @@
-import unittest
-from unittest.mock import patch, MagicMock
+import asyncio
 
-from httpx import Response, HTTPStatusError
+import httpx
+import pytest
 
 from core.collectors.issue_collector import IssueCollector
 from core.collectors.mcp_collector import MCPCollector
 from utils.errors import CollectorError
 
 
-class TestIssueCollector(unittest.TestCase):
+_ISSUE_URL = "https://api.github.com/repos/test/repo/issues/{}"
 
-    @patch("core.collectors.issue_collector.is_git_repository", return_value=True)
-    @patch("core.collectors.issue_collector.get_current_branch_name", return_value="feature/123-test-branch")
-    @patch("httpx.Client.get")
-    def test_collect_success(self, mock_get, mock_branch_name, mock_is_repo):
-        # Arrange
-        mock_response = MagicMock(spec=Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"title": "Test Issue", "number": 123}
-        mock_get.return_value = mock_response
 
-        collector = IssueCollector(repo="test/repo", token_env_var="FAKE_TOKEN")
+@pytest.fixture
+def on_branch(mocker):
+    """Pretends to be inside a git repository on the given branch."""
+    def checkout(branch_name):
+        mocker.patch("core.collectors.issue_collector.get_work_tree_branch", return_value=branch_name)
+    return checkout
 
-        # Act
-        result = collector.collect()
 
-        # Assert
-        self.assertIn("issue", result)
-        self.assertEqual(result["issue"]["title"], "Test Issue")
-        mock_get.assert_called_once_with(
-            "https://api.github.com/repos/test/repo/issues/123",
-            headers={}
-        )
+def _issue_collector(mock_http, **kwargs):
+    collector = IssueCollector(**kwargs)
+    # The blocking client is created lazily; hand it the mock transport instead.
+    collector._client = mock_http.sync_client
+    return collector
 
-    @patch("core.collectors.issue_collector.is_git_repository", return_value=True)
-    @patch("core.collectors.issue_collector.get_current_branch_name", return_value="feature/no-issue")
-    def test_collect_no_issue_number_in_branch(self, mock_branch_name, mock_is_repo):
-        # Arrange
-        collector = IssueCollector(repo="test/repo")
 
-        # Act
-        result = collector.collect()
+# IssueCollector
 
-        # Assert
-        self.assertEqual(result, {})
+def test_issue_collect_success(on_branch, mock_http):
+    # Arrange
+    on_branch("feature/123-test-branch")
+    mock_http.add("GET", _ISSUE_URL.format(123), httpx.Response(200, json={"title": "Test Issue", "number": 123}))
+    collector = _issue_collector(mock_http, repo="test/repo", token_env_var="FAKE_TOKEN")
 
-    @patch("core.collectors.issue_collector.is_git_repository", return_value=True)
-    @patch("core.collectors.issue_collector.get_current_branch_name", return_value="feature/456-not-found")
-    @patch("httpx.Client.get")
-    def test_collect_issue_not_found(self, mock_get, mock_branch_name, mock_is_repo):
-        # Arrange
-        mock_request = MagicMock()
-        mock_response = MagicMock(spec=Response)
-        mock_response.status_code = 404
-        mock_response.request = mock_request
-        mock_response.raise_for_status.side_effect = HTTPStatusError(
-            "Not Found", request=mock_request, response=mock_response
-        )
-        mock_get.return_value = mock_response
+    # Act
+    result = collector.collect()
 
-        collector = IssueCollector(repo="test/repo")
+    # Assert
+    assert result["issue"]["title"] == "Test Issue"
+    (request,) = mock_http.requests
+    assert "Authorization" not in request.headers
 
-        # Act
-        result = collector.collect()
 
-        # Assert
-        # The main behavior is that it should return an empty dict gracefully.
-        self.assertEqual(result, {})
-        # NOTE: The log assertion for this case proved to be brittle and was removed.
-        # The log is confirmed to be emitted via pytest's stderr capture.
+def test_issue_acollect_success(on_branch, mock_http):
+    # Arrange: the async path goes through the shared client of utils.http
+    on_branch("feature/123-test-branch")
+    mock_http.add("GET", _ISSUE_URL.format(123), httpx.Response(200, json={"title": "Test Issue", "number": 123}))
+    collector = IssueCollector(repo="test/repo", token_env_var="FAKE_TOKEN")
 
-    @patch("core.collectors.issue_collector.is_git_repository", return_value=True)
-    @patch("core.collectors.issue_collector.get_current_branch_name", return_value="feature/789-api-error")
-    def test_collect_no_repo_configured(self, mock_branch_name, mock_is_repo):
-        # Arrange
-        collector = IssueCollector() # No repo configured
+    # Act
+    result = asyncio.run(collector.acollect())
 
-        # Act & Assert
-        with self.assertRaisesRegex(CollectorError, "Failed to collect issue details"):
-            collector.collect()
+    # Assert
+    assert result["issue"]["title"] == "Test Issue"
+    (request,) = mock_http.requests
+    assert "Authorization" not in request.headers
 
-    @patch("core.collectors.issue_collector.is_git_repository", return_value=False)
-    def test_collect_not_a_git_repo(self, mock_is_repo):
-        # Arrange
-        collector = IssueCollector(repo="test/repo")
 
-        # Act
-        result = collector.collect()
+def test_issue_collect_no_issue_number_in_branch(on_branch, mock_http):
+    # Arrange
+    on_branch("feature/no-issue")
+    collector = _issue_collector(mock_http, repo="test/repo")
 
-        # Assert
-        self.assertEqual(result, {})
-        mock_is_repo.assert_called_once()
+    # Act
+    result = collector.collect()
 
+    # Assert
+    assert result == {}
+    assert mock_http.requests == []
 
-class TestMCPCollector(unittest.TestCase):
 
-    def test_instantiate_and_collect(self):
-        # Arrange
-        collector = MCPCollector()
+def test_issue_collect_issue_not_found(on_branch, mock_http):
+    # Arrange
+    on_branch("feature/456-not-found")
+    mock_http.add("GET", _ISSUE_URL.format(456), httpx.Response(404, json={"message": "Not Found"}))
+    collector = _issue_collector(mock_http, repo="test/repo")
 
-        # Act
-        result = collector.collect()
+    # Act
+    result = collector.collect()
 
-        # Assert
-        # Just test its basic functionality, logging is secondary for this placeholder
-        self.assertEqual(result, {"mcp_data": {}})
+    # Assert: a missing issue is not an error
+    assert result == {}
 
 
-if __name__ == "__main__":
-    unittest.main()
+def test_issue_collect_no_repo_configured(on_branch):
+    # Arrange
+    on_branch("feature/789-api-error")
+    collector = IssueCollector()  # No repo configured
+
+    # Act & Assert
+    with pytest.raises(CollectorError, match="Failed to collect issue details"):
+        collector.collect()
+
+
+def test_issue_collect_not_a_git_repo(mocker):
+    # Arrange
+    mock_branch = mocker.patch("core.collectors.issue_collector.get_work_tree_branch", return_value=None)
+    collector = IssueCollector(repo="test/repo")
+
+    # Act
+    result = collector.collect()
+
+    # Assert
+    assert result == {}
+    mock_branch.assert_called_once()
+
+
+# MCPCollector
+
+def test_mcp_instantiate_and_collect():
+    # Arrange
+    collector = MCPCollector()
+
+    # Act
+    result = collector.collect()
+
+    # Assert
+    # Just test its basic functionality, logging is secondary for this placeholder
+    assert result == {"mcp_data": {}}
+
+
+def test_mcp_acollect_runs_on_event_loop(mocker):
+    # Arrange
+    collector = MCPCollector()
+    mock_to_thread = mocker.patch("asyncio.to_thread")
+
+    # Act
+    result = asyncio.run(collector.acollect())
+
+    # Assert
+    assert result == {"mcp_data": {}}
+    mock_to_thread.assert_not_called()
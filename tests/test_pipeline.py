@@ -1,87 +1,312 @@
 import asyncio
-import unittest
-from unittest.mock import patch
+import threading
+
+import pytest
 
 from config.models import CacheConfig, CollectorConfig, Config, FormatterConfig, ModelConfig
 from core.contracts.models import Context, FileChange
 from core.pipeline import CommitMessageGenerator
+from utils.errors import CollectorError
+
+
+# Dummy components for testing
+class DummyCollector:
+    def collect(self):
+        return {
+            "files": [FileChange(path="a.txt", diff="+a")],
+            "readme": "Dummy readme",
+        }
+
+
+class DummyProvider:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def generate(self, prompt: str, *, stream: bool = False) -> str:
+        return "feat: dummy feature"
 
 
 # Mock the registries
-@patch("core.pipeline.collector_registry")
-@patch("core.pipeline.provider_registry")
-class TestCommitMessageGenerator(unittest.TestCase):
-    def setUp(self):
-        # Dummy components for testing
-        class DummyCollector:
-            def collect(self):
-                return {
-                    "files": [FileChange(path="a.txt", diff="+a")],
-                    "readme": "Dummy readme",
-                }
-
-        class DummyProvider:
-            def __init__(self, *args, **kwargs):
-                pass
-
-            async def generate(self, prompt: str, *, stream: bool = False) -> str:
-                return "feat: dummy feature"
-
-        self.dummy_collector = DummyCollector
-        self.dummy_provider = DummyProvider
-
-        # Mock config to use dummy components
-        self.config = Config(
-            model=ModelConfig(provider="dummy"),
-            formatter=FormatterConfig(template="simple.j2"),
-            collectors=[CollectorConfig(type="dummy")],
-            cache=CacheConfig(enabled=False)  # Disable cache for testing
-        )
-
-    def test_generate_end_to_end(self, mock_provider_registry, mock_collector_registry):
-        """
-        Tests the full pipeline from collection to formatting.
-        """
-        # Configure mocks
-        mock_collector_registry.get.return_value = self.dummy_collector
-        mock_provider_registry.get.return_value = self.dummy_provider
-
-        # Instantiate the generator
-        generator = CommitMessageGenerator(config=self.config)
-
-        # Run the pipeline
-        result = asyncio.run(generator.generate())
-
-        # Assertions
-        mock_collector_registry.get.assert_called_once_with("dummy")
-        mock_provider_registry.get.assert_called_once_with("dummy")
-
-        # The simple.j2 template just returns the model output directly
-        self.assertEqual(result, "feat: dummy feature")
-
-    def test_prompt_creation(self, mock_provider_registry, mock_collector_registry):
-        """
-        Tests if the prompt is created correctly based on context.
-        """
-        # Configure mocks
-        mock_collector_registry.get.return_value = self.dummy_collector
-        mock_provider_registry.get.return_value = self.dummy_provider
-
-        generator = CommitMessageGenerator(config=self.config)
-
-        context = Context(
-            files=[FileChange(path="a.txt", diff="+a")],
-            readme="Test readme.",
-            recent_commits=["fix: bug #123"]
-        )
-
-        prompt = generator._create_prompt(context)
-
-        self.assertIn("The output language should be en.", prompt)
-        self.assertIn("README Summary:\nTest readme.", prompt)
-        self.assertIn("Recent Commits:\n- fix: bug #123", prompt)
-        self.assertIn("File: a.txt\n```diff\n+a\n```", prompt)
-
-
-if __name__ == "__main__":
-    unittest.main()
+@pytest.fixture(autouse=True)
+def collector_registry(mocker):
+    registry = mocker.patch("core.pipeline.collector_registry")
+    registry.get.return_value = DummyCollector
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def provider_registry(mocker):
+    registry = mocker.patch("core.pipeline.provider_registry")
+    registry.get.return_value = DummyProvider
+    return registry
+
+
+@pytest.fixture
+def config():
+    # Mock config to use dummy components
+    return Config(
+        model=ModelConfig(provider="dummy"),
+        formatter=FormatterConfig(template="simple.j2"),
+        collectors=[CollectorConfig(type="dummy")],
+        cache=CacheConfig(enabled=False)  # Disable cache for testing
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_end_to_end(config, collector_registry, provider_registry):
+    """
+    Tests the full pipeline from collection to formatting.
+    """
+    generator = CommitMessageGenerator(config=config)
+
+    result = await generator.generate()
+
+    collector_registry.get.assert_called_once_with("dummy")
+    provider_registry.get.assert_called_once_with("dummy")
+    # The simple.j2 template just returns the model output directly
+    assert result == "feat: dummy feature"
+
+
+@pytest.mark.asyncio
+async def test_formatter_is_reused_across_runs(config):
+    """
+    Tests that one generator builds its formatter (and compiles its template) only once.
+    """
+    generator = CommitMessageGenerator(config=config)
+
+    await generator.generate()
+    formatter = generator._formatter
+    await generator.generate()
+
+    assert formatter is not None
+    assert generator._formatter is formatter
+
+
+@pytest.mark.asyncio
+async def test_generate_many_overlaps_provider_calls(config, provider_registry):
+    """
+    Tests that generate_many sends all requests at once and keeps the input order.
+    """
+    running = {"now": 0, "peak": 0}
+
+    class SlowProvider:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def generate(self, prompt: str, *, stream: bool = False) -> str:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return "feat: " + prompt.split("File: ")[1].split("\n")[0]
+
+    provider_registry.get.return_value = SlowProvider
+    generator = CommitMessageGenerator(config=config)
+    contexts = [Context(files=[FileChange(path=path, diff="+x")]) for path in ("a.txt", "b.txt", "c.txt")]
+
+    result = await generator.generate_many(contexts)
+
+    assert result == ["feat: a.txt", "feat: b.txt", "feat: c.txt"]
+    assert running["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_collectors_run_concurrently(config, collector_registry):
+    """
+    Tests that async collectors overlap instead of running one after another.
+    """
+    running = {"now": 0, "peak": 0}
+
+    class SlowCollector:
+        def __init__(self, key):
+            self.key = key
+
+        def collect(self):
+            raise AssertionError("acollect should be preferred")
+
+        async def acollect(self):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return {self.key: [self.key]}
+
+    collector_registry.get.return_value = SlowCollector
+    config = config.model_copy(update={
+        "collectors": [
+            CollectorConfig(type="slow", options={"key": "recent_commits"}),
+            CollectorConfig(type="slow", options={"key": "issues"}),
+        ],
+    })
+    generator = CommitMessageGenerator(config=config)
+
+    result = await generator._collect_context()
+
+    assert result == {"recent_commits": ["recent_commits"], "issues": ["issues"]}
+    assert running["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_blocking_collector_is_built_off_the_loop(config, collector_registry):
+    """
+    Tests that a blocking collector is constructed in the worker thread, and that
+    constructor failures still surface as CollectorError.
+    """
+    threads = []
+
+    class BlockingCollector:
+        def __init__(self, fail=False):
+            threads.append(threading.get_ident())
+            if fail:
+                raise ValueError("bad option")
+
+        def collect(self):
+            return {"readme": "text"}
+
+    collector_registry.get.return_value = BlockingCollector
+    generator = CommitMessageGenerator(config=config)
+
+    assert await generator._collect_context() == {"readme": "text"}
+    assert threads != [threading.get_ident()]
+
+    failing = config.model_copy(update={
+        "collectors": [CollectorConfig(type="blocking", options={"fail": True})],
+    })
+    with pytest.raises(CollectorError, match="Failed to instantiate or run collector 'blocking'"):
+        await CommitMessageGenerator(config=failing)._collect_context()
+
+
+def test_aggregate_context_maps_collector_outputs(config):
+    """
+    Tests that raw diff/history/issue collector outputs populate the Context fields.
+    """
+    generator = CommitMessageGenerator(config=config)
+    diff = (
+        "diff --git a/a.txt b/a.txt\n--- a/a.txt\n+++ b/a.txt\n@@ -0,0 +1 @@\n+a\n"
+        "diff --git a/b.txt b/b.txt\n--- a/b.txt\n+++ b/b.txt\n@@ -0,0 +1 @@\n+b\n"
+    )
+
+    context = generator._aggregate_context({
+        "diff": diff,
+        "history": ["fix: bug"],
+        "issue": {"title": "Issue"},
+    })
+
+    assert [f.path for f in context.files] == ["a.txt", "b.txt"]
+    assert context.files[1].diff.startswith("diff --git a/b.txt b/b.txt")
+    assert context.recent_commits == ["fix: bug"]
+    assert context.issues == [{"title": "Issue"}]
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_provider(config, provider_registry, tmp_path):
+    """
+    Tests that a second run over the same diff is served from the cache.
+    """
+    config = config.model_copy(update={
+        "cache": CacheConfig(enabled=True, directory=str(tmp_path)),
+    })
+    assert await CommitMessageGenerator(config).generate() == "feat: dummy feature"
+    assert provider_registry.get.call_count == 1
+
+    assert await CommitMessageGenerator(config).generate() == "feat: dummy feature"
+    assert provider_registry.get.call_count == 1
+
+    # A different model must not reuse the cached message.
+    other = config.model_copy(update={"model": ModelConfig(provider="dummy", name="other")})
+    await CommitMessageGenerator(other).generate()
+    assert provider_registry.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_streaming_forwards_chunks(config, provider_registry):
+    """
+    Tests that streamed chunks reach the callback and the joined output is formatted.
+    """
+    class StreamingProvider:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def generate(self, prompt: str, *, stream: bool = False):
+            async def chunks():
+                for chunk in ["feat: ", "dummy ", "feature"]:
+                    yield chunk
+            return chunks()
+
+    provider_registry.get.return_value = StreamingProvider
+    received = []
+
+    generator = CommitMessageGenerator(config=config)
+    result = await generator.generate_streaming(received.append)
+
+    assert received == ["feat: ", "dummy ", "feature"]
+    assert result == "feat: dummy feature"
+
+
+@pytest.mark.asyncio
+async def test_generate_streaming_closes_stream_on_error(config, provider_registry):
+    """
+    Tests that the provider stream is closed at once when the callback fails mid-stream.
+    """
+    closed = []
+
+    class StreamingProvider:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def generate(self, prompt: str, *, stream: bool = False):
+            async def chunks():
+                try:
+                    yield "feat: "
+                    yield "never consumed"
+                finally:
+                    closed.append(True)
+            return chunks()
+
+    def on_chunk(chunk):
+        raise RuntimeError("display failed")
+
+    provider_registry.get.return_value = StreamingProvider
+    generator = CommitMessageGenerator(config=config)
+
+    with pytest.raises(RuntimeError):
+        await generator.generate_streaming(on_chunk)
+    # Checked while the loop is still running, so the loop's shutdown cannot have closed it.
+    assert closed == [True]
+
+
+def test_prompt_creation(config):
+    """
+    Tests if the prompt is created correctly based on context.
+    """
+    generator = CommitMessageGenerator(config=config)
+
+    context = Context(
+        files=[FileChange(path="a.txt", diff="+a")],
+        readme="Test readme.",
+        recent_commits=["fix: bug #123"]
+    )
+
+    prompt = generator._create_prompt(context)
+
+    assert "The output language should be en." in prompt
+    assert "README Summary:\nTest readme." in prompt
+    assert "Recent Commits:\n- fix: bug #123" in prompt
+    assert "File: a.txt\n```diff\n+a\n```" in prompt
+
+
+def test_prompt_truncates_long_diffs(config):
+    """
+    Tests that diffs longer than output.max_diff_chars are cut and marked in the prompt.
+    """
+    config = config.model_copy(deep=True)
+    config.output.max_diff_chars = 4
+    generator = CommitMessageGenerator(config=config)
+
+    prompt = generator._create_prompt(Context(files=[
+        FileChange(path="a.txt", diff="+abcdef"),
+        FileChange(path="b.txt", diff="+b"),
+    ]))
+
+    assert "File: a.txt\n```diff\n+abc\n... (diff truncated)\n```" in prompt
+    assert "File: b.txt\n```diff\n+b\n```" in prompt
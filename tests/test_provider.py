@@ -7,8 +7,14 @@ from core.llm.router import get_provider
 from core.llm.providers.openai import OpenAIProvider
 from utils.errors import ProviderError
 
+# With pytest-xdist (`-n auto --dist=loadgroup`) a provider's tests share one worker.
+pytestmark = pytest.mark.xdist_group(name="openai")
 
-@pytest.fixture
+
+_URL = "https://api.openai.com/v1/chat/completions"
+
+
+@pytest.fixture(scope="session")
 def openai_config():
     return ModelConfig(
         provider="openai",
@@ -16,10 +22,21 @@ def openai_config():
         api_key="test_api_key"
     )
 
-def test_get_provider_openai(openai_config):
+@pytest.fixture(scope="module")
+def openai_provider(openai_config, session_http):
+    """One provider for the module's tests; requests go to the session's mock transport."""
+    return OpenAIProvider(openai_config, client=session_http.client)
+
+def test_get_provider_openai(providers):
     """Tests that the router returns an OpenAIProvider instance."""
+    assert isinstance(providers["openai"], OpenAIProvider)
+
+def test_get_provider_reuses_instance(openai_config):
+    """Tests that the router shares one provider per model configuration."""
     provider = get_provider(openai_config)
-    assert isinstance(provider, OpenAIProvider)
+
+    assert get_provider(openai_config.model_copy()) is provider
+    assert get_provider(openai_config.model_copy(update={"name": "gpt-4o"})) is not provider
 
 def test_get_provider_unknown():
     """Tests that the router raises an error for an unknown provider."""
@@ -35,79 +52,26 @@ def test_openai_provider_init_no_api_key(mocker):
         OpenAIProvider(config)
 
 @pytest.mark.asyncio
-async def test_openai_provider_generate_non_stream(openai_config, mocker):
-    """Tests the non-streaming generate method."""
-    mock_response = mocker.MagicMock(spec=httpx.Response)
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "choices": [{"message": {"content": "Hello, world!"}}]
-    }
-
-    mock_post = mocker.patch("httpx.AsyncClient.post", return_value=mock_response)
-
-    provider = OpenAIProvider(openai_config)
-    result = await provider.generate("Say hi")
-
-    assert result == "Hello, world!"
-    mock_post.assert_called_once()
-    call_args = mock_post.call_args[1]['json']
-    assert call_args['model'] == "gpt-4o-mini"
-    assert call_args['stream'] is False
-
-@pytest.mark.asyncio
-async def test_openai_provider_generate_stream(openai_config, mocker):
-    """Tests the streaming generate method."""
-    chunks = [
-        'data: {"choices": [{"delta": {"content": "Hello"}}]}',
-        'data: {"choices": [{"delta": {"content": ", "}}]}',
-        'data: {"choices": [{"delta": {"content": "world!"}}]}',
-        'data: [DONE]'
-    ]
+async def test_openai_provider_rate_limit(openai_config, mocker, mock_http):
+    """Tests that a configured RPM limit throttles requests and a 429 slows the bucket down."""
+    mock_http.add("POST", _URL, httpx.Response(429, json={"error": {"message": "Rate limit reached"}}))
 
-    async def aiter_lines():
-        for chunk in chunks:
-            yield chunk
+    provider = OpenAIProvider(openai_config.model_copy(update={"rpm": 60}), client=mock_http.client)
+    acquire = mocker.spy(provider._bucket, "acquire")
+    slow_down = mocker.spy(provider._bucket, "slow_down")
 
-    mock_response = mocker.MagicMock(spec=httpx.Response)
-    mock_response.aiter_lines.return_value = aiter_lines()
-
-    # Create an async context manager mock
-    async_mock_context = mocker.AsyncMock()
-    async_mock_context.__aenter__.return_value = mock_response
-
-    mock_stream = mocker.patch("httpx.AsyncClient.stream", return_value=async_mock_context)
-
-    provider = OpenAIProvider(openai_config)
-    stream_result = await provider.generate("Say hi", stream=True)
-
-    result = [chunk async for chunk in stream_result]
-    assert result == ["Hello", ", ", "world!"]
-    mock_stream.assert_called_once()
-    call_args = mock_stream.call_args[1]['json']
-    assert call_args['stream'] is True
-
-@pytest.mark.asyncio
-async def test_openai_provider_http_error(openai_config, mocker):
-    """Tests that a ProviderError is raised on HTTP status errors."""
-    mock_response = mocker.MagicMock(spec=httpx.Response)
-    mock_response.status_code = 401
-    mock_response.text = "Unauthorized"
-    mock_response.json.return_value = {"error": {"message": "Invalid API key"}}
-
-    http_error = httpx.HTTPStatusError(
-        "Unauthorized", request=mocker.MagicMock(), response=mock_response
-    )
-    mocker.patch("httpx.AsyncClient.post", side_effect=http_error)
-
-    provider = OpenAIProvider(openai_config)
-    with pytest.raises(ProviderError, match="OpenAI API error \\(401\\): Invalid API key"):
+    with pytest.raises(ProviderError, match="OpenAI API error \\(429\\): Rate limit reached"):
         await provider.generate("Say hi")
+    acquire.assert_called_once()
+    slow_down.assert_called_once()
+    assert OpenAIProvider(openai_config)._bucket is None
 
 @pytest.mark.asyncio
-async def test_openai_provider_timeout_error(openai_config, mocker):
-    """Tests that a ProviderError is raised on timeout."""
-    mocker.patch("httpx.AsyncClient.post", side_effect=httpx.TimeoutException("Timeout!"))
+async def test_openai_provider_stream_http_error_reads_body(openai_provider, mock_http):
+    """Tests that the error body of a streamed request is still available after the stream closes."""
+    mock_http.add("POST", _URL, mock_http.stream([b'{"error": {"message": "Invalid API key"}}'], status_code=401))
 
-    provider = OpenAIProvider(openai_config)
-    with pytest.raises(ProviderError, match="Request to OpenAI timed out: Timeout!"):
-        await provider.generate("Say hi")
+    stream = await openai_provider.generate("Say hi", stream=True)
+    with pytest.raises(ProviderError, match="OpenAI API error \\(401\\): Invalid API key"):
+        async for _ in stream:
+            pass
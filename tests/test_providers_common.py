@@ -0,0 +1,106 @@
+"""Scenarios shared by the providers that speak the OpenAI chat completions API."""
+import json
+
+import httpx
+import pytest
+
+from config.models import ModelConfig
+from core.llm.providers.deepseek import DeepSeekProvider
+from core.llm.providers.local import LocalProvider
+from core.llm.providers.openai import OpenAIProvider
+from utils.errors import ProviderError
+
+
+# name: (provider class, config, endpoint, error prefix, timeout prefix)
+_PROVIDERS = {
+    "openai": (
+        OpenAIProvider,
+        ModelConfig(provider="openai", name="gpt-4o-mini", api_key="test_api_key"),
+        "https://api.openai.com/v1/chat/completions",
+        "OpenAI API error",
+        "Request to OpenAI timed out",
+    ),
+    "deepseek": (
+        DeepSeekProvider,
+        ModelConfig(provider="deepseek", name="deepseek-chat", api_key="test_deepseek_api_key"),
+        "https://api.deepseek.com/v1/chat/completions",
+        "DeepSeek API error",
+        "Request to DeepSeek timed out",
+    ),
+    "local": (
+        LocalProvider,
+        ModelConfig(provider="local", name="llama3", base_url="http://localhost:11434/v1", api_key="ollama"),
+        "http://localhost:11434/v1/chat/completions",
+        "Local provider API error",
+        "Request to local provider timed out",
+    ),
+}
+
+# Built once per session; each SSE event arrives as its own network chunk.
+_SSE_CHUNKS = tuple(
+    (line + "\n\n").encode("utf-8")
+    for line in (
+        'data: {"choices": [{"delta": {"content": "Hello"}}]}',
+        'data: {"choices": [{"delta": {"content": " from"}}]}',
+        'data: {"choices": [{"delta": {"content": " the model!"}}]}',
+        'data: [DONE]',
+    )
+)
+
+
+# Each case joins its provider's xdist group (see the provider test modules).
+@pytest.fixture(scope="module", params=[
+    pytest.param(name, marks=pytest.mark.xdist_group(name=name)) for name in sorted(_PROVIDERS)
+])
+def compatible(request, session_http):
+    """An OpenAI-compatible provider on the session's mock transport, with its table entry."""
+    provider_cls, config, url, error_prefix, timeout_prefix = _PROVIDERS[request.param]
+    return provider_cls(config, client=session_http.client), config, url, error_prefix, timeout_prefix
+
+@pytest.mark.asyncio
+async def test_provider_generate_non_stream(compatible, mock_http):
+    """Tests the non-streaming generate method."""
+    provider, config, url, _, _ = compatible
+    mock_http.add("POST", url, httpx.Response(200, json={
+        "choices": [{"message": {"content": "Hello from the model!"}}]
+    }))
+
+    result = await provider.generate("Say hi")
+
+    assert result == "Hello from the model!"
+    assert len(mock_http.requests) == 1
+    call_args = json.loads(mock_http.requests[0].content)
+    assert call_args['model'] == config.name
+    assert call_args['stream'] is False
+
+@pytest.mark.asyncio
+async def test_provider_generate_stream(compatible, mock_http):
+    """Tests the streaming generate method."""
+    provider, _, url, _, _ = compatible
+    mock_http.add("POST", url, mock_http.stream(_SSE_CHUNKS))
+
+    stream_result = await provider.generate("Say hi", stream=True)
+
+    result = [chunk async for chunk in stream_result]
+    assert result == ["Hello", " from", " the model!"]
+    assert len(mock_http.requests) == 1
+    call_args = json.loads(mock_http.requests[0].content)
+    assert call_args['stream'] is True
+
+@pytest.mark.asyncio
+async def test_provider_http_error(compatible, mock_http):
+    """Tests that a ProviderError is raised on HTTP status errors."""
+    provider, _, url, error_prefix, _ = compatible
+    mock_http.add("POST", url, httpx.Response(401, json={"error": {"message": "Invalid API key"}}))
+
+    with pytest.raises(ProviderError, match=f"{error_prefix} \\(401\\): Invalid API key"):
+        await provider.generate("Say hi")
+
+@pytest.mark.asyncio
+async def test_provider_timeout_error(compatible, mock_http):
+    """Tests that a ProviderError is raised on timeout."""
+    provider, _, url, _, timeout_prefix = compatible
+    mock_http.add("POST", url, httpx.TimeoutException("Timeout!"))
+
+    with pytest.raises(ProviderError, match=f"{timeout_prefix}: Timeout!"):
+        await provider.generate("Say hi")
@@ -0,0 +1,44 @@
+import asyncio
+
+from utils.ratelimit import TokenBucket
+
+
+def test_token_bucket_allows_burst_then_waits(mocker):
+    """Tests that the bucket serves its capacity at once and then spaces requests by the refill rate."""
+    clock = mocker.patch("utils.ratelimit.time.monotonic", return_value=100.0)
+    bucket = TokenBucket(capacity=2, refill_rate=1.0)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # Reservations queue up: each caller waits for its own token.
+    assert bucket.reserve() == 1.0
+    assert bucket.reserve() == 2.0
+
+    clock.return_value = 110.0
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_slow_down_halves_rate(mocker):
+    """Tests that slow_down halves the refill rate until the penalty expires."""
+    clock = mocker.patch("utils.ratelimit.time.monotonic", return_value=0.0)
+    bucket = TokenBucket(capacity=1, refill_rate=1.0)
+    bucket.reserve()
+
+    bucket.slow_down(duration_sec=60.0)
+    assert bucket.reserve() == 2.0
+
+    clock.return_value = 100.0
+    bucket.reserve()
+    assert bucket.reserve() == 1.0
+
+
+def test_token_bucket_acquire_sleeps_for_the_deficit(mocker):
+    """Tests that acquire sleeps only when the bucket is empty."""
+    mocker.patch("utils.ratelimit.time.monotonic", return_value=0.0)
+    sleep = mocker.patch("utils.ratelimit.asyncio.sleep", new=mocker.AsyncMock())
+    bucket = TokenBucket.per_minute(30)
+
+    asyncio.run(bucket.acquire())
+    sleep.assert_not_called()
+    asyncio.run(bucket.acquire())
+    sleep.assert_awaited_once_with(2.0)
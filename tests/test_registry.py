@@ -52,16 +52,20 @@ def test_registry_get_unregistered_component():
 
 def test_registry_register_duplicate_component():
     """Tests that registering a component with a duplicate name raises a ValueError."""
-    with pytest.raises(ValueError):
-        @collector_registry.register("dummy")
-        class AnotherDummyCollector:
-            pass
+    # A local registry, so the shared ones are never touched by this test.
+    registry = Registry("test")
+
+    @registry.register("dummy")
+    class DummyComponent:
+        pass
 
-    with pytest.raises(ValueError):
-        @provider_registry.register("dummy")
-        class AnotherDummyProvider:
+    with pytest.raises(ValueError, match="Component 'dummy' already registered in 'test' registry"):
+        @registry.register("dummy")
+        class AnotherDummyComponent:
             pass
 
+    assert registry.get("dummy") is DummyComponent
+
 
 def test_registry_contains():
     """Tests the `__contains__` method."""
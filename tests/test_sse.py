@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from core.llm import _sse
+from core.llm._sse import parse_claude_event, parse_openai_delta
+from utils.sse import iter_sse_data
+
+
+async def _collect(chunks):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    return [data async for data in iter_sse_data(source())]
+
+
+def test_iter_sse_data_reassembles_split_lines():
+    """Tests that payloads split across network chunks are yielded whole, in order."""
+    chunks = [b'event: delta\ndata: {"a"', b': 1}\n\nda', b"ta: [DONE]\n\n"]
+
+    assert asyncio.run(_collect(chunks)) == [b'{"a": 1}', b"[DONE]"]
+
+
+def test_iter_sse_data_line_spanning_chunks_without_newlines():
+    """Tests a payload delivered in several chunks that contain no line break at all."""
+    chunks = [b"data: {", b'"a": ', b"1", b"}\ndata: [DONE]\n"]
+
+    assert asyncio.run(_collect(chunks)) == [b'{"a": 1}', b"[DONE]"]
+
+
+def test_iter_sse_data_crlf_and_unterminated_last_line():
+    """Tests CRLF line endings and a final data line that has no terminator."""
+    chunks = [b": keep-alive\r\ndata: first\r\n\r\n", b"data:second"]
+
+    assert asyncio.run(_collect(chunks)) == [b"first", b"second"]
+
+
+def test_parse_openai_delta():
+    """Tests text extraction from OpenAI-compatible chunks, ignoring non-text chunks."""
+    assert parse_openai_delta(b'{"choices": [{"delta": {"content": "Hi"}}]}') == "Hi"
+    assert parse_openai_delta(b'{"choices": [{"delta": {"role": "assistant"}}]}') is None
+    assert parse_openai_delta(b'{"choices": []}') is None
+    assert parse_openai_delta(b"not json") is None
+
+
+def test_parse_claude_event():
+    """Tests text deltas and the stop event of the Anthropic stream."""
+    text_delta = b'{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}'
+
+    assert parse_claude_event(text_delta) == ("Hi", False)
+    assert parse_claude_event(b'{"type": "message_start", "message": {}}') == (None, False)
+    assert parse_claude_event(b'{"type": "message_stop"}') == (None, True)
+    assert parse_claude_event(b"{") == (None, False)
+
+
+def test_parsers_skip_invalid_utf8_without_orjson(monkeypatch):
+    """Tests that a frame of invalid UTF-8 is skipped when the stdlib JSON parser is used."""
+    monkeypatch.setattr(_sse, "loads", json.loads)
+
+    assert parse_openai_delta(b'{"choices": [{"delta": {"content": "\xff"}}]}') is None
+    assert parse_claude_event(b'{"type": "\xff"}') == (None, False)
@@ -0,0 +1,57 @@
+import hashlib
+import os
+from pathlib import Path
+
+# Top-level packages and modules that make up the installed application.
+APP_ROOT = Path(__file__).resolve().parent.parent
+APP_PACKAGES = ("cli.py", "commands", "config", "core", "utils")
+# One sentinel per install location, so that several installs (e.g. two virtualenvs,
+# or a checkout next to an installed copy) do not overwrite each other's record.
+SENTINEL_PATH = Path("~/.cache/aicommit").expanduser() / (
+    ".compiled-" + hashlib.sha1(str(APP_ROOT).encode("utf-8")).hexdigest()[:16]
+)
+
+
+def _install_fingerprint() -> str:
+    """
+    Identifies the current install so that upgrades trigger a recompile.
+
+    Only the mtime of this module is tracked: reinstalling or upgrading rewrites
+    it along with the rest of the package. Edits to other modules of a source
+    checkout are not detected, but Python recompiles those on import anyway.
+    """
+    return f"{APP_ROOT}:{os.stat(Path(__file__)).st_mtime_ns}"
+
+
+def ensure_bytecode_compiled() -> None:
+    """
+    Byte-compiles the application once per install.
+
+    Installs made without `--compile` / `--compile-bytecode` leave Python to
+    compile every module lazily on first import, which a git hook pays in full.
+    A sentinel file records the install that was compiled, so subsequent runs
+    cost a single small file read. Failures (e.g. a read-only site-packages)
+    are ignored: Python still falls back to compiling in memory.
+    """
+    fingerprint = _install_fingerprint()
+    try:
+        if SENTINEL_PATH.read_text(encoding="utf-8") == fingerprint:
+            return
+    except OSError:
+        pass
+
+    # Only pay for importing compileall on the one-off compile run.
+    import compileall
+
+    try:
+        for name in APP_PACKAGES:
+            target = APP_ROOT / name
+            if target.is_dir():
+                # In-process: the package is small, and a process pool inside a git hook is not.
+                compileall.compile_dir(str(target), quiet=1, workers=1)
+            elif target.is_file():
+                compileall.compile_file(str(target), quiet=1)
+        SENTINEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SENTINEL_PATH.write_text(fingerprint, encoding="utf-8")
+    except OSError:
+        pass
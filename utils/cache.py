@@ -1,14 +1,35 @@
 import hashlib
-import json
+import os
+import tempfile
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, Tuple
 from utils.logger import logger
 
+# Recently read or written entries, shared by all Cache instances of the process:
+# entry file -> (timestamp, value). A pipeline builds a new Cache per run, so a
+# per-instance memo would never be hit again; as it is, repeated runs in one
+# process (e.g. `aicommit daemon`) skip the disk.
+MEMO_SIZE = 64
+_memo: "OrderedDict[Path, Tuple[float, str]]" = OrderedDict()
+
+
+def _remember(cache_file: Path, timestamp: float, value: str) -> None:
+    _memo[cache_file] = (timestamp, value)
+    _memo.move_to_end(cache_file)
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+
 
 class Cache:
     """
     A simple file-based cache for storing LLM responses.
+
+    Each entry is a file holding the raw UTF-8 value; its modification time
+    is the entry's timestamp, so a lookup is one stat plus one read. Entries
+    are sharded into 256 subdirectories by the first byte of their key
+    (`ab/cdef...`, like git's object store) to keep directories small.
     """
 
     def __init__(self, cache_dir: str, ttl_sec: int):
@@ -21,6 +42,8 @@ class Cache:
         """
         self.cache_dir = Path(cache_dir).expanduser()
         self.ttl_sec = ttl_sec
+        # Shard directories known to exist, so `set` creates each one only once.
+        self._shards: Set[str] = set()
         if self.is_enabled():
             try:
                 self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -33,8 +56,17 @@ class Cache:
         return self.ttl_sec > 0
 
     def _get_key(self, content: str) -> str:
-        """Generates a SHA256 hash for the given content to use as a cache key."""
-        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+        """
+        Generates a BLAKE2b hash for the given content to use as a cache key.
+
+        Cache keys are not a security boundary; BLAKE2b is faster than SHA-256
+        in CPython and keeps the same 256-bit, 64-character hex keys.
+        """
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=32).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """Returns the file of the entry for `key` inside its shard directory."""
+        return self.cache_dir / key[:2] / key[2:]
 
     def get(self, content: str) -> Optional[str]:
         """
@@ -51,24 +83,32 @@ class Cache:
             return None
 
         key = self._get_key(content)
-        cache_file = self.cache_dir / key
-        if not cache_file.exists():
-            logger.debug(f"Cache miss (key not found): {key}")
-            return None
+        cache_file = self._entry_path(key)
+        memo = _memo.get(cache_file)
+        if memo is not None:
+            timestamp, value = memo
+            if time.time() - timestamp <= self.ttl_sec:
+                _memo.move_to_end(cache_file)
+                logger.debug("Cache hit (in memory): {}", key)
+                return value
+            # Expired: drop it here and let the disk lookup below remove the file.
+            del _memo[cache_file]
 
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            timestamp = data.get("timestamp", 0)
-            if time.time() - timestamp > self.ttl_sec:
-                logger.debug(f"Cache miss (expired): {key}")
+            stat = cache_file.stat()
+            if time.time() - stat.st_mtime > self.ttl_sec:
+                logger.debug("Cache miss (expired): {}", key)
                 cache_file.unlink()  # Delete expired cache file
                 return None
 
-            logger.debug(f"Cache hit: {key}")
-            return data.get("value")
-        except (IOError, json.JSONDecodeError, OSError) as e:
+            value = cache_file.read_bytes().decode("utf-8")
+            _remember(cache_file, stat.st_mtime, value)
+            logger.debug("Cache hit: {}", key)
+            return value
+        except FileNotFoundError:
+            logger.debug("Cache miss (key not found): {}", key)
+            return None
+        except (IOError, OSError, UnicodeDecodeError) as e:
             logger.warning(f"Could not read or decode cache file {cache_file}: {e}")
             return None
 
@@ -84,14 +124,24 @@ class Cache:
             return
 
         key = self._get_key(content)
-        cache_file = self.cache_dir / key
-        data = {
-            "timestamp": time.time(),
-            "value": value
-        }
+        cache_file = self._entry_path(key)
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            logger.debug(f"Cached new item with key: {key}")
+            shard = key[:2]
+            if shard not in self._shards:
+                cache_file.parent.mkdir(exist_ok=True)
+                self._shards.add(shard)
+            # Written to a temporary file and renamed into place, so concurrent readers
+            # (e.g. hooks in parallel worktrees) never see a partial entry. The rename
+            # keeps the write's mtime, which serves as the entry's timestamp.
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(value.encode("utf-8"))
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            _remember(cache_file, time.time(), value)
+            logger.debug("Cached new item with key: {}", key)
         except (IOError, OSError) as e:
             logger.warning(f"Could not write to cache file {cache_file}: {e}")
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import List, Union
+
+from rich.console import Console, Group, RenderableType
+
+
+class BufferedConsole(Console):
+    """
+    A rich Console that queues renderables and writes them in a single pass.
+    Queued strings are parsed as console markup, just like `Console.print`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending: List[RenderableType] = []
+
+    def queue(self, renderable: Union[str, RenderableType]) -> None:
+        """Adds a renderable (or markup string) to be printed on the next flush."""
+        if isinstance(renderable, str):
+            renderable = self.render_str(renderable)
+        self._pending.append(renderable)
+
+    def flush(self) -> None:
+        """Prints all queued renderables at once."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self.print(Group(*pending))
+
+
+@lru_cache(maxsize=None)
+def get_console() -> BufferedConsole:
+    """Returns the process-wide console, constructed on first use."""
+    return BufferedConsole()
@@ -0,0 +1,18 @@
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine to completion on a fresh event loop, like `asyncio.run`.
+    Uses uvloop's libuv-based loop when it is installed (not available on Windows).
+    """
+    # Imported here so that importing this module stays free for the CLI fast paths.
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+
+        return asyncio.run(coro)
+    return uvloop.run(coro)
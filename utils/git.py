@@ -1,7 +1,52 @@
+import contextlib
+import os
+import re
 import subprocess
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
 from utils.errors import AICommitException
 
 
+# Variables git sets for hooks that choose the repository, work tree and index;
+# `git commit -a`, `git commit <paths>` and --include/--only stage into a temporary index.
+HOOK_ENV_VARS = ("GIT_INDEX_FILE", "GIT_DIR", "GIT_WORK_TREE")
+
+# The hook's HOOK_ENV_VARS while the daemon serves its request (see `hook_environment`).
+_hook_env: Optional[Dict[str, str]] = None
+
+
+def git_env() -> Dict[str, str]:
+    """
+    Environment for read-only git commands: the C locale skips git's message
+    translation, and optional locks keep `git diff` from refreshing the index.
+    Inside `hook_environment`, the hook's repository, work tree and index are used.
+    """
+    env = {**os.environ, "LC_ALL": "C", "GIT_OPTIONAL_LOCKS": "0"}
+    if _hook_env is not None:
+        for name in HOOK_ENV_VARS:
+            env.pop(name, None)
+        env.update(_hook_env)
+    return env
+
+
+@contextlib.contextmanager
+def hook_environment(env: Mapping[str, str]) -> Iterator[None]:
+    """
+    Runs the read-only git commands of the block as seen by the hook that sent `env`,
+    for a process (the daemon) that serves hooks with its own environment.
+
+    Args:
+        env: The hook's values of HOOK_ENV_VARS; missing or empty ones are unset.
+    """
+    global _hook_env
+    _hook_env = {name: env[name] for name in HOOK_ENV_VARS if env.get(name)}
+    try:
+        yield
+    finally:
+        _hook_env = None
+
+
 def is_git_repository() -> bool:
     """Checks if the current directory is a Git repository."""
     try:
@@ -10,6 +55,7 @@ def is_git_repository() -> bool:
             capture_output=True,
             text=True,
             check=True,
+            env=git_env(),
         )
         return result.stdout.strip() == "true"
     except (subprocess.CalledProcessError, FileNotFoundError):
@@ -24,6 +70,7 @@ def has_staged_changes() -> bool:
         subprocess.run(
             ["git", "diff", "--cached", "--quiet"],
             check=True,
+            env=git_env(),
         )
         return False  # Exit code 0 means no staged changes
     except FileNotFoundError:
@@ -34,34 +81,56 @@ def has_staged_changes() -> bool:
         raise AICommitException(f"An unexpected error occurred while checking for staged changes: {e}")
 
 
-def get_current_branch_name() -> str:
+def get_work_tree_branch() -> Optional[str]:
     """
-    Gets the current Git branch name.
+    Gets the current Git branch name, or None outside a Git work tree.
+
+    A single `git rev-parse` answers both questions, where checking
+    `is_git_repository` before `get_current_branch_name` would fork git twice.
+    Nothing is cached: the daemon changes directory (and the user may switch
+    branches) between runs.
 
     Returns:
-        The current branch name.
+        The current branch name ("HEAD" when detached), or None if the current
+        directory is not inside a work tree or git is not installed.
 
     Raises:
-        AICommitException: If the git command fails or not in a git repository.
+        AICommitException: If the branch cannot be resolved, e.g. in a repository without commits.
     """
-    if not is_git_repository():
-        raise AICommitException("Not a Git repository.")
-
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            ["git", "rev-parse", "--is-inside-work-tree", "--abbrev-ref", "HEAD"],
             capture_output=True,
             text=True,
-            check=True,
             encoding="utf-8",
+            env=git_env(),
         )
-        return result.stdout.strip()
     except FileNotFoundError:
-        raise AICommitException("Git is not installed or not in PATH.")
-    except subprocess.CalledProcessError as e:
-        raise AICommitException(f"Failed to get current branch name: {e.stderr}")
-    except Exception as e:
-        raise AICommitException(f"An unexpected error occurred while getting branch name: {e}")
+        return None
+
+    # rev-parse answers each option on its own line, stopping at the first failure.
+    lines = result.stdout.splitlines()
+    if not lines or lines[0] != "true":
+        return None
+    if result.returncode != 0 or len(lines) < 2:
+        raise AICommitException(f"Failed to get current branch name: {result.stderr}")
+    return lines[1].strip()
+
+
+def get_current_branch_name() -> str:
+    """
+    Gets the current Git branch name.
+
+    Returns:
+        The current branch name.
+
+    Raises:
+        AICommitException: If the git command fails or not in a git repository.
+    """
+    branch_name = get_work_tree_branch()
+    if branch_name is None:
+        raise AICommitException("Not a Git repository.")
+    return branch_name
 
 
 def get_staged_diff() -> str:
@@ -75,22 +144,146 @@ def get_staged_diff() -> str:
         AICommitException: If the git command fails.
     """
     try:
+        # Capture raw bytes and decode once, instead of going through a text-mode wrapper.
         result = subprocess.run(
-            ["git", "diff", "--cached"],
+            ["git", "diff", "--cached", "--no-color"],
             capture_output=True,
-            text=True,
-            encoding="utf-8",
+            env=git_env(),
         )
         if result.returncode not in [0, 1]:
-             raise AICommitException(f"Failed to get git diff: {result.stderr}")
+             raise AICommitException(f"Failed to get git diff: {result.stderr.decode('utf-8', 'replace')}")
 
-        return result.stdout
+        return result.stdout.decode("utf-8", "replace")
     except FileNotFoundError:
         raise AICommitException("Git is not installed or not in PATH.")
     except Exception as e:
         raise AICommitException(f"An unexpected error occurred while getting git diff: {e}")
 
 
+def _section_path(header: str) -> str:
+    """Returns the post-image path of a `diff --git` header ("a/<path> b/<path>")."""
+    return header.rsplit(" b/", 1)[-1] if " b/" in header else header
+
+
+def staged_file_stats() -> List[Tuple[str, Optional[int], Optional[int], Optional[str]]]:
+    """
+    Lists the staged files with their changed line counts, without reading any diff.
+
+    Returns:
+        (path, added lines, deleted lines, source path) tuples from
+        `git diff --cached --numstat`, with paths relative to the top of the work
+        tree. The counts are None for binary files; the source path is set for
+        renames and copies only.
+
+    Raises:
+        AICommitException: If git is missing or the command fails.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--cached", "--numstat", "-z"],
+            capture_output=True,
+            env=git_env(),
+        )
+    except FileNotFoundError:
+        raise AICommitException("Git is not installed or not in PATH.")
+    if result.returncode != 0:
+        raise AICommitException(f"Failed to get git diff stats: {result.stderr.decode('utf-8', 'replace')}")
+
+    stats: List[Tuple[str, Optional[int], Optional[int], Optional[str]]] = []
+    # Each entry is "added\tdeleted\tpath\0"; renames and copies leave the path
+    # empty and follow it with "source\0destination\0".
+    fields = iter(result.stdout.split(b"\0"))
+    for field in fields:
+        if not field:
+            continue
+        added, deleted, path = field.split(b"\t", 2)
+        source = None
+        if not path:
+            source = os.fsdecode(next(fields, b""))
+            path = next(fields, b"")
+        stats.append((
+            os.fsdecode(path),
+            None if added == b"-" else int(added),
+            None if deleted == b"-" else int(deleted),
+            source,
+        ))
+    return stats
+
+
+def iter_staged_diff_files(exclude: Iterable[str] = ()) -> Iterator[Tuple[str, str]]:
+    """
+    Streams the staged changes from Git as per-file diff sections.
+
+    Unlike `get_staged_diff` followed by `split_diff_by_file`, the full diff is
+    never held in memory as one string (and then copied again into sections):
+    git's output is read line by line and each file's section is decoded and
+    yielded as soon as the next file starts.
+
+    Args:
+        exclude: Paths, relative to the top of the work tree (as `staged_file_stats`
+            returns them), whose diff git should not produce at all.
+
+    Yields:
+        (path, diff section) tuples, in diff order, as `split_diff_by_file` returns them.
+
+    Raises:
+        AICommitException: If git is missing or the command fails.
+    """
+    try:
+        args = ["git", "diff", "--cached", "--no-color"]
+        excluded = [f":(top,exclude,literal){path}" for path in exclude]
+        if excluded:
+            args += ["--", ":/", *excluded]
+        # stderr goes to a file, since nothing reads it while stdout is streamed:
+        # a full stderr pipe would block git, and with it this loop.
+        with tempfile.TemporaryFile() as errors, subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=errors,
+            env=git_env(),
+        ) as proc:
+            section: List[bytes] = []
+            for line in proc.stdout:
+                if line.startswith(b"diff --git ") and section:
+                    yield _decode_section(section)
+                    section = []
+                if section or line.startswith(b"diff --git "):
+                    section.append(line)
+            if section:
+                yield _decode_section(section)
+            returncode = proc.wait()
+            errors.seek(0)
+            stderr = errors.read()
+    except FileNotFoundError:
+        raise AICommitException("Git is not installed or not in PATH.")
+    if returncode not in [0, 1]:
+        raise AICommitException(f"Failed to get git diff: {stderr.decode('utf-8', 'replace')}")
+
+
+def _decode_section(lines: List[bytes]) -> Tuple[str, str]:
+    section = b"".join(lines).decode("utf-8", "replace").rstrip("\n")
+    header = section.split("\n", 1)[0][len("diff --git "):]
+    return _section_path(header), section
+
+
+def split_diff_by_file(diff: str) -> List[Tuple[str, str]]:
+    """
+    Splits a unified `git diff` into per-file sections.
+
+    Args:
+        diff: The full output of `git diff`.
+
+    Returns:
+        A list of (path, diff section) tuples, in diff order.
+    """
+    sections: List[Tuple[str, str]] = []
+    # Only headers at the start of a line begin a section; hunk lines may quote them.
+    for section in re.split(r"^diff --git ", diff, flags=re.M)[1:]:
+        header = section.split("\n", 1)[0]
+        sections.append((_section_path(header), "diff --git " + section.rstrip("\n")))
+    return sections
+
+
 def commit(message: str) -> None:
     """
     Creates a Git commit with the given message.
@@ -0,0 +1,48 @@
+import asyncio
+import importlib.util
+import weakref
+
+import httpx
+
+# Connections are cheap to keep and expensive to re-establish (DNS + TLS).
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# Idle connections are kept for 30s (httpx defaults to 5s), so that back-to-back
+# commits handled by `aicommit daemon` skip the TCP and TLS handshakes.
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0)
+# Retry failed connection attempts once; requests themselves are never replayed.
+CONNECT_RETRIES = 1
+# HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One client per event loop: httpx connections are bound to the loop that opened them.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared async HTTP client for the running event loop,
+    creating it on first use.
+
+    Callers pass absolute URLs and their own headers; the client only
+    carries connection pooling, keep-alive and HTTP/2 settings, so all
+    providers and collectors share its connections (and TLS sessions).
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        # With an explicit transport, pooling and HTTP/2 are configured on the transport.
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=DEFAULT_LIMITS,
+            retries=CONNECT_RETRIES,
+        )
+        client = httpx.AsyncClient(transport=transport, timeout=DEFAULT_TIMEOUT)
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Closes the shared client of the running event loop, if one was created."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,17 @@
+import json
+
+# orjson parses small payloads several times faster than the stdlib, which matters
+# on streaming paths that decode one JSON object per token (`pip install orjson`).
+# Its JSONDecodeError subclasses json.JSONDecodeError, so callers catch the stdlib one.
+try:
+    from orjson import dumps, loads
+except ImportError:
+    from json import loads
+
+    def dumps(obj) -> bytes:
+        """Serializes `obj` to compact UTF-8 JSON bytes, like orjson.dumps."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+JSONDecodeError = json.JSONDecodeError
+
+__all__ = ["JSONDecodeError", "dumps", "loads"]
@@ -1,6 +1,169 @@
+import os
+import queue
 import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
 import loguru
 
+
+class BufferedFileSink:
+    """
+    A loguru sink that appends records to a file through a write buffer.
+
+    The file is only opened by the first record, so runs that log nothing to it
+    never touch it. Records are written out in one go once ``flush_bytes`` are pending, or
+    ``flush_interval`` seconds after the first pending record, whichever comes first.
+    The file is rotated to ``<stem>.<time><suffix>`` before it would grow past
+    ``rotation_bytes``; rotated files older than ``retention_sec`` are then deleted.
+    """
+
+    def __init__(
+        self,
+        path,
+        *,
+        flush_bytes=32 * 1024,
+        flush_interval=0.1,
+        rotation_bytes=10 * 1024 * 1024,
+        retention_sec=7 * 24 * 3600,
+    ):
+        # Resolved once, so a later chdir (e.g. in the daemon) keeps the same file.
+        self._path = Path(os.path.abspath(path))
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        self._rotation_bytes = rotation_bytes
+        self._retention_sec = retention_sec
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = 0
+        self._file = None
+
+    def write(self, message):
+        data = message.encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                self._open()
+            elif self._size and self._size + len(data) > self._rotation_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+            self._pending += len(data)
+            if self._pending >= self._flush_bytes:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def stop(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush()
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        os.makedirs(self._path.parent, exist_ok=True)
+        # Larger than flush_bytes, so only _flush() decides when to write.
+        self._file = open(self._path, "ab", buffering=2 * self._flush_bytes)
+        self._size = os.fstat(self._file.fileno()).st_size
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._file.flush()
+            self._pending = 0
+
+    def _on_timer(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def _rotate(self):
+        self._flush()
+        self._file.close()
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        os.replace(self._path, self._path.with_name(f"{self._path.stem}.{stamp}{self._path.suffix}"))
+        self._open()
+
+        cutoff = time.time() - self._retention_sec
+        for rotated in self._path.parent.glob(f"{self._path.stem}.*{self._path.suffix}"):
+            try:
+                if rotated.stat().st_mtime < cutoff:
+                    rotated.unlink()
+            except OSError:
+                pass
+
+
+class QueuedSink:
+    """
+    A loguru sink that hands records to another sink on a worker thread.
+
+    Stands in for ``enqueue=True``, which pickles every record through a
+    ``multiprocessing.SimpleQueue`` that grows without bound. The queue here holds at
+    most ``maxsize`` records; when the worker falls behind, the oldest one is dropped.
+    The worker thread is started by the first record.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink, *, maxsize=10000):
+        self._sink = sink
+        self._queue = queue.Queue(maxsize)
+        self._worker = None
+
+    def write(self, message):
+        # Loguru calls a handler's sink under its lock, so this cannot start two workers.
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="aicommit-log", daemon=True)
+            self._worker.start()
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    pass
+
+    def join(self):
+        """Blocks until every record queued so far has been handed to the wrapped sink."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def stop(self):
+        # Loguru no longer writes to a removed handler, so the queue drains up to here.
+        if self._worker is not None:
+            self._queue.put(self._STOP)
+            self._worker.join()
+            self._worker = None
+        self._sink.stop()
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            if message is self._STOP:
+                self._queue.task_done()
+                return
+            try:
+                self._sink.write(message)
+            except Exception as e:
+                sys.stderr.write(f"Failed to write log record: {e!r}\n")
+            finally:
+                self._queue.task_done()
+
+
+# The queued file sink installed by the latest setup_logger() call.
+file_sink = None
+
+
 def setup_logger(log_level="INFO", log_file="aicommit.log"):
     """
     Set up a logger with console and file handlers.
@@ -11,24 +174,28 @@ def setup_logger(log_level="INFO", log_file="aicommit.log"):
     """
     loguru.logger.remove()  # Remove default handler
 
-    # Console logger
+    # Console logger: coloured only when stderr is a terminal (loguru also honours
+    # NO_COLOR/FORCE_COLOR). Loguru settles this and builds the per-level templates in add().
     loguru.logger.add(
         sys.stderr,
         level=log_level,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True,
     )
 
-    # File logger
+    # Tracebacks with local variables can be slow to render and may contain API keys,
+    # so they are only written when explicitly asked for. The same goes for DEBUG
+    # records, which include full dumps of the merged config and of every diff.
+    diag = os.getenv("AICOMMIT_DIAG") == "1"
+
+    # File logger: 10 MB rotation, 7 days retention
+    global file_sink
+    file_sink = QueuedSink(BufferedFileSink(log_file))
     loguru.logger.add(
-        log_file,
-        level="DEBUG",
+        file_sink,
+        level="DEBUG" if diag else "INFO",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="10 MB",
-        retention="7 days",
-        enqueue=True,
-        backtrace=True,
-        diagnose=True,
+        backtrace=diag,
+        diagnose=diag,
     )
 
     return loguru.logger
@@ -0,0 +1,61 @@
+"""Client-side request throttling for LLM APIs."""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    A token bucket that delays requests instead of letting the API reject them.
+
+    `acquire` reserves its tokens before it awaits anything, so concurrent callers
+    on one event loop are served in arrival order without a lock; the bucket may go
+    negative, and each caller sleeps until its own reservation is covered.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Args:
+            capacity: The largest burst of requests sent without waiting.
+            refill_rate: Tokens added per second.
+        """
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("capacity and refill_rate must be positive.")
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._slowed_until = 0.0
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: int) -> "TokenBucket":
+        """A bucket for an RPM limit, allowing bursts of up to one second's worth of requests."""
+        return cls(capacity=max(1.0, requests_per_minute / 60), refill_rate=requests_per_minute / 60)
+
+    def _current_rate(self, now: float) -> float:
+        # Multiplicative decrease after a 429, restored once the penalty expires.
+        return self.refill_rate / 2 if now < self._slowed_until else self.refill_rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + self._current_rate(now) * (now - self._last_refill))
+        self._last_refill = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Takes `tokens` from the bucket and returns how long to wait before using them."""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= tokens
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._current_rate(now)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Waits until `tokens` may be spent."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def slow_down(self, duration_sec: float = 60.0) -> None:
+        """Halves the refill rate for `duration_sec`, e.g. after an HTTP 429 response."""
+        now = time.monotonic()
+        self._refill(now)
+        self._slowed_until = now + duration_sec
@@ -0,0 +1,45 @@
+"""Helpers for reading Server-Sent Events streams from LLM APIs."""
+from typing import AsyncGenerator, AsyncIterable, List
+
+# Every payload line of an SSE stream starts with this field name.
+DATA_PREFIX = b"data:"
+DATA_PREFIX_LEN = len(DATA_PREFIX)
+# OpenAI-compatible APIs end the stream with this payload.
+DONE_SENTINEL = b"[DONE]"
+
+
+async def iter_sse_data(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes, None]:
+    """
+    Yields the payload of each `data:` line as soon as the line is complete.
+
+    Works on raw bytes (e.g. `response.aiter_bytes()`), so that no str decoding
+    or line buffering happens before a token can be handed to the JSON parser.
+    Payloads are stripped, which also drops the `\\r` of CRLF line endings.
+    """
+    # Chunks are scanned as immutable bytes, so each payload costs one slice (and
+    # one strip); a partial line is kept as parts and joined once its newline arrives,
+    # which stays linear even for a line spread over many chunks.
+    pending: List[bytes] = []
+    async for chunk in chunks:
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(chunk)
+            chunk = b"".join(pending)
+            pending.clear()
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                break
+            # A bounded startswith compares in place: no slice or copy per line.
+            if chunk.startswith(DATA_PREFIX, start, end):
+                yield chunk[start + DATA_PREFIX_LEN:end].strip()
+            start = end + 1
+        if start < len(chunk):
+            pending.append(chunk[start:])
+    # A final line without a terminator is still a complete line at EOF.
+    rest = b"".join(pending)
+    if rest.startswith(DATA_PREFIX):
+        yield rest[DATA_PREFIX_LEN:].strip()